@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bot Yapılandırması
+Anahtar kelime listeleri, prompt'lar, temperature değerleri, bekleme süreleri ve
+trend URL'leri için dışarıdan okunan, çalışırken yeniden yüklenebilen yapılandırma.
+
+Yapılandırma dosyası (varsayılan: ../config/bot_config.json, BOT_CONFIG_PATH ile
+değiştirilebilir) sadece değiştirilmek istenen anahtarları içerebilir; eksik olanlar
+aşağıdaki varsayılanlardan alınır. Dosya değiştiğinde arka plandaki izleyici onu
+doğrular, matcher/prompt nesnelerine derler ve tek seferde yenisiyle değiştirir.
+"""
+
+import copy
+import json
+import logging
+import os
+import re
+import string
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'bot_config.json'
+)
+
+# Dosyanın kaç saniyede bir kontrol edileceği
+DEFAULT_POLL_SECONDS = 5.0
+
+DEFAULT_CONFIG = {
+    "reply_bot": {
+        "ataturk_negative_phrases": [
+            "atatürk düşman",
+            "atatürk karşıt",
+            "atatürk nefret",
+            "atatürk hakaret",
+            "mustafa kemal düşman",
+            "kemalist düşman",
+            "atatürk sevmiyorum",
+            "atatürk nefret ediyorum"
+        ],
+        # Cevap VERİLMEMELİ konular
+        "sensitive_keywords": [
+            "şehit",
+            "cenaze",
+            "ölüm",
+            "ölmüş",
+            "öldü",
+            "öldürüldü",
+            "katledildi",
+            "vuruldu",
+            "kaza",
+            "trafik kazası",
+            "deprem",
+            "sel",
+            "yangın",
+            "terör",
+            "bomba",
+            "saldırı",
+            "hastane",
+            "ameliyat",
+            "kanser",
+            "hasta",
+            "rahatsız",
+            "başsağlığı",
+            "taziye",
+            "yas",
+            "acı",
+            "üzüntü",
+            "felaket",
+            "afet",
+            "yardım kampanyası",
+            "bağış",
+            "yardım",
+            # Milli günler ve bayramlar (milli takım hariç)
+            "milli gün",
+            "cumhuriyet bayramı",
+            "zafer bayramı",
+            "23 nisan",
+            "19 mayıs",
+            "30 ağustos",
+            "29 ekim"
+        ],
+        "troll_indicators": [
+            "troll",
+            "şaka",
+            "mizah",
+            "komik",
+            "gül",
+            "lol",
+            "haha",
+            "😂",
+            "🤣",
+            "😄"
+        ],
+        "milli_takim_keywords": [
+            "milli takım",
+            "a milli",
+            "milli futbol",
+            "fifa",
+            "dünya kupası",
+            "play-off",
+            "elemeler",
+            "bizimçocuklar",
+            "montella",
+            "hakan çalhanoğlu",
+            "galibiyet",
+            "zafer",
+            "tebrik",
+            "tebrikler"
+        ],
+        "prompts": {
+            "ataturk": """Birisi şu tweet'i attı: "{tweet_text}"
+
+Bu kişi Atatürk'e hakaret ediyor. Ona dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap yaz.
+- Dark mizah içermeli (sert, kudurtucu ama hakaret değil)
+- Onu kudurtmalı, sinirlendirmeli ama küfür/hakaret içermemeli
+- Alaycı, küçümseyici ton kullan ama yasal sınırlar içinde kal
+- Dava edilme riski olmamalı (açık hakaret yok)
+- Maksimum 280 karakter
+- Sadece cevabı yaz, başka açıklama ekleme""",
+            "milli_takim": """Birisi şu tweet'i attı: "{tweet_text}"
+
+Bu tweet milli takım ile ilgili. Ona troll, eğlenceli, absürt ama dark mizah olmayan bir cevap yaz.
+- Troll ve eğlenceli olmalı
+- Absürt ve komik olabilir
+- Dark mizah, kudurtucu veya saygısız olmamalı
+- Milli takıma hakaret etme, sadece eğlenceli troll yap
+- Maksimum 280 karakter
+- Sadece cevabı yaz, başka açıklama ekleme""",
+            "genel": """Birisi şu tweet'i attı: "{tweet_text}"
+
+Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap yaz.
+- Dark mizah içermeli (sert, kudurtucu ama hakaret değil)
+- Alaycı, küçümseyici, kudurtucu ton kullan
+- Onu sinirlendirmeli ama küfür/hakaret içermemeli
+- Yasal sınırlar içinde kal (açık hakaret yok)
+- Maksimum 280 karakter
+- Sadece cevabı yaz, başka açıklama ekleme""",
+            "system_milli_takim": "Sen troll, eğlenceli, absürt tweet cevapları yazan bir asistansın. Milli takım tweet'lerine troll ve eğlenceli cevaplar verirsin. Absürt ve komik olabilirsin ama dark mizah, kudurtucu veya saygısız olmazsın. Milli takıma hakaret etmezsin.",
+            "system_genel": "Sen dark mizahlı, kudurtucu, agresif tweet cevapları yazan bir asistansın. Alaycı, küçümseyici ama yasal sınırlar içinde kalarak kudurtucu cevaplar üretirsin. Küfür ve açık hakaret kullanmazsın ama kudurtucu olursun."
+        },
+        "temperature": 0.95,
+        # Groq model kademeleri: ilki ana model; gecikme bütçesi içinde cevap gelmezse sıradaki de başlatılır
+        "models": {
+            "tiers": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+            "latency_budget_seconds": 4.0,
+            "timeout_seconds": 15
+        },
+        # Cevabı akış (SSE) olarak al, 280 karakter dolunca cümle sınırından kesip bağlantıyı kapat
+        "stream_generation": True,
+        # Milli takım için biraz daha düşük temperature
+        "milli_takim_temperature": 0.8,
+        # Queue'da tweet varsa tekrar deneme aralığı
+        "queue_retry_seconds": 60,
+        # Queue boşsa bekleme süresi
+        "idle_minutes": 15,
+        "error_retry_seconds": 60,
+        # Önceki cevaplara çok benzeyen cevapları engelle (bkz. similarity_index.py)
+        "similarity": {
+            "enabled": True,
+            # 0-1 arası tahmini benzerlik; bu değer ve üstü tekrar sayılır
+            "threshold": 0.6
+        },
+        # Yeniden başlatınca rate limit durumu ve tweet kuyruğu kaldığı yerden devam etsin (bkz. state_snapshot.py)
+        "state_snapshot": {
+            "enabled": True,
+            # Bundan eski durum dosyası yok sayılır (dakika)
+            "max_age_minutes": 60
+        },
+        # Dış kaynaklar için devre kesici ayarları (bkz. circuit_breaker.py)
+        "circuit_breaker": {
+            "window_size": 10,
+            "min_calls": 3,
+            "failure_rate_threshold": 0.5,
+            "open_seconds": 180
+        }
+    },
+    "trend_bot": {
+        # Trendleri toplanacak bölgeler; ilk bölge ana bölgedir. twitter_trending opsiyonel.
+        "regions": [
+            {
+                "name": "turkey",
+                "trends24": "https://trends24.in/turkey/",
+                "twitter_trending": "https://www.twitter-trending.com/turkey/tr"
+            }
+        ],
+        # Tüm bölgeler için aynı anda açık olabilecek en fazla bağlantı (değişiklik yeniden başlatınca tam geçerli olur)
+        "max_connections": 4,
+        # Aynı siteye art arda iki istek arasında beklenecek süre (saniye)
+        "per_host_delay_seconds": 0.5,
+        "system_prompt": "Sen Türkçe ağır troll tweet'ler yazan bir asistansın. Absürt, karanlık mizah, ironik ve komik tweet'ler yazarsın. Ama kesinlikle yasal sınırlar içinde kalırsın - hakaret, küfür, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazmazsın. Sadece absürt ve komik olursun.",
+        "tweet_prompt": "Türkçe bir Twitter tweet'i yaz. Konu: {trend}. Tweet ağır troll, absürt, karanlık mizah içermeli ama kesinlikle yasal sınırlar içinde kalmalı. Hakaret, küfür, kişisel saldırı, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazma. Sadece absürt, saçma, komik, ironik ve troll bir yorum yap. Günlük konuşma dilinde, samimi ama absürt olsun. Maksimum 250 karakter. Sadece tweet metnini yaz, başka açıklama ekleme.",
+        # Playwright'ta görsel/font/analitik isteklerini engelle, networkidle yerine veriyi bekle
+        "lean_playwright": True,
+        # Seçilen tüm trendler için tweet'leri tek Groq isteğinde (JSON) üret
+        "batch_generation": True,
+        "batch_prompt": "Türkçe Twitter tweet'leri yaz. Aşağıdaki her konu için ayrı bir tweet yaz.\nKonular:\n{trends}\nHer tweet ağır troll, absürt, karanlık mizah içermeli ama kesinlikle yasal sınırlar içinde kalmalı. Hakaret, küfür, kişisel saldırı, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazma. Sadece absürt, saçma, komik, ironik ve troll bir yorum yap. Günlük konuşma dilinde, samimi ama absürt olsun. Her tweet maksimum 250 karakter. Cevabı sadece şu JSON formatında ver, başka açıklama ekleme: {{\"tweets\": [{{\"id\": 1, \"tweet\": \"...\"}}]}}",
+        # Tekli üretimde tweet'i akış (SSE) olarak al, 280 karakter dolunca cümle sınırından kesip bağlantıyı kapat
+        "stream_generation": True,
+        # Groq model kademeleri: ilki ana model; gecikme bütçesi içinde cevap gelmezse sıradaki de başlatılır
+        "models": {
+            "tiers": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+            "latency_budget_seconds": 4.0,
+            "timeout_seconds": 15
+        },
+        # Daha yaratıcı ve absürt olması için
+        "temperature": 1.2,
+        "cycle_minutes": 5,
+        # Döngü slotlarına eklenen 0-N saniye rastgele gecikme (her döngü aynı saniyede başlamasın)
+        "cycle_jitter_seconds": 20,
+        # İki tweet arasındaki rastgele bekleme (dakika)
+        "post_gap_min_minutes": 1.0,
+        "post_gap_max_minutes": 4.0,
+        "error_retry_minutes": 5,
+        # Bir döngünün (toplama + üretim + tweet'ler + aradaki bekleme) en fazla süresi; istek zaman aşımları bundan kalanla sınırlanır
+        "cycle_deadline_seconds": 300,
+        # Önceki tweet'lere çok benzeyen tweet'leri engelle (bkz. similarity_index.py)
+        "similarity": {
+            "enabled": True,
+            # 0-1 arası tahmini benzerlik; bu değer ve üstü tekrar sayılır
+            "threshold": 0.6
+        },
+        # Yeniden başlatınca rate limit durumu, son trendler ve çıkarma istatistikleri kaldığı yerden devam etsin (bkz. state_snapshot.py)
+        "state_snapshot": {
+            "enabled": True,
+            # Bundan eski durum dosyası yok sayılır (dakika)
+            "max_age_minutes": 30
+        },
+        # Dış kaynaklar için devre kesici ayarları (bkz. circuit_breaker.py)
+        "circuit_breaker": {
+            "window_size": 10,
+            "min_calls": 3,
+            "failure_rate_threshold": 0.5,
+            "open_seconds": 180
+        }
+    }
+}
+
+# Her prompt'ta bulunması gereken yer tutucular
+REQUIRED_PLACEHOLDERS = {
+    ("reply_bot", "prompts", "ataturk"): {"tweet_text"},
+    ("reply_bot", "prompts", "milli_takim"): {"tweet_text"},
+    ("reply_bot", "prompts", "genel"): {"tweet_text"},
+    ("reply_bot", "prompts", "system_milli_takim"): set(),
+    ("reply_bot", "prompts", "system_genel"): set(),
+    ("trend_bot", "system_prompt"): set(),
+    ("trend_bot", "tweet_prompt"): {"trend"},
+    ("trend_bot", "batch_prompt"): {"trends"},
+}
+
+
+class ConfigError(ValueError):
+    """Yapılandırma dosyası geçersiz olduğunda fırlatılır"""
+
+
+class KeywordMatcher:
+    """Anahtar kelime listesini tek bir regex'e derler (küçük harfli alt metin araması)"""
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = tuple(keyword.lower() for keyword in keywords)
+        # Uzun kelimeler önce denensin ki "trafik kazası" "kaza"dan önce yakalansın
+        ordered = sorted(set(self.keywords), key=len, reverse=True)
+        self._pattern = re.compile('|'.join(re.escape(k) for k in ordered)) if ordered else None
+
+    def find(self, text: str) -> Optional[str]:
+        """Metinde geçen ilk anahtar kelimeyi döndürür, yoksa None"""
+        if self._pattern is None or not text:
+            return None
+        match = self._pattern.search(text.lower())
+        return match.group(0) if match else None
+
+    def matches(self, text: str) -> bool:
+        return self.find(text) is not None
+
+
+class PromptTemplate:
+    """str.format yer tutuculu prompt şablonu"""
+
+    def __init__(self, template: str, required: set):
+        fields = {name for _, name, _, _ in string.Formatter().parse(template) if name is not None}
+        unknown = fields - required
+        missing = required - fields
+        if unknown:
+            raise ConfigError(f"bilinmeyen yer tutucu(lar): {', '.join(sorted(unknown))}")
+        if missing:
+            raise ConfigError(f"eksik yer tutucu(lar): {', '.join(sorted(missing))}")
+        self.template = template
+
+    def render(self, **kwargs) -> str:
+        return self.template.format(**kwargs)
+
+
+class ReplyBotSettings:
+    """Reply bot için derlenmiş yapılandırma"""
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        self.ataturk_negative_matcher = _matcher(raw, 'ataturk_negative_phrases')
+        self.sensitive_matcher = _matcher(raw, 'sensitive_keywords')
+        self.troll_matcher = _matcher(raw, 'troll_indicators')
+        self.milli_takim_matcher = _matcher(raw, 'milli_takim_keywords')
+        prompts = raw['prompts']
+        self.ataturk_prompt = _compile_prompt(prompts, ("reply_bot", "prompts", "ataturk"))
+        self.milli_takim_prompt = _compile_prompt(prompts, ("reply_bot", "prompts", "milli_takim"))
+        self.general_prompt = _compile_prompt(prompts, ("reply_bot", "prompts", "genel"))
+        self.system_milli_takim = _compile_prompt(prompts, ("reply_bot", "prompts", "system_milli_takim")).render()
+        self.system_general = _compile_prompt(prompts, ("reply_bot", "prompts", "system_genel")).render()
+        self.temperature = float(raw['temperature'])
+        self.milli_takim_temperature = float(raw['milli_takim_temperature'])
+        self.stream_generation = raw['stream_generation']
+        self.models = _model_options(raw)
+        self.queue_retry_seconds = _positive(raw, 'queue_retry_seconds')
+        self.idle_minutes = _positive(raw, 'idle_minutes')
+        self.error_retry_seconds = _positive(raw, 'error_retry_seconds')
+        self.similarity = _similarity_options(raw)
+        self.state_snapshot = _state_snapshot_options(raw)
+        self.circuit_breaker = _circuit_breaker_options(raw)
+
+
+class TrendBotSettings:
+    """Trend bot için derlenmiş yapılandırma"""
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        self.regions = _regions(raw['regions'])
+        self.max_connections = int(_positive(raw, 'max_connections'))
+        self.per_host_delay_seconds = raw['per_host_delay_seconds']
+        if self.per_host_delay_seconds < 0:
+            raise ConfigError("per_host_delay_seconds negatif olamaz")
+        self.lean_playwright = raw['lean_playwright']
+        self.system_prompt = _compile_prompt(raw, ("trend_bot", "system_prompt")).render()
+        self.tweet_prompt = _compile_prompt(raw, ("trend_bot", "tweet_prompt"))
+        self.batch_generation = raw['batch_generation']
+        self.batch_prompt = _compile_prompt(raw, ("trend_bot", "batch_prompt"))
+        self.stream_generation = raw['stream_generation']
+        self.models = _model_options(raw)
+        self.temperature = float(raw['temperature'])
+        self.cycle_minutes = _positive(raw, 'cycle_minutes')
+        self.cycle_jitter_seconds = raw['cycle_jitter_seconds']
+        if not 0 <= self.cycle_jitter_seconds < self.cycle_minutes * 60:
+            raise ConfigError("cycle_jitter_seconds 0 ile döngü süresi arasında olmalı")
+        self.post_gap_min_minutes = _positive(raw, 'post_gap_min_minutes')
+        self.post_gap_max_minutes = _positive(raw, 'post_gap_max_minutes')
+        if self.post_gap_min_minutes > self.post_gap_max_minutes:
+            raise ConfigError("post_gap_min_minutes, post_gap_max_minutes'dan büyük olamaz")
+        self.error_retry_minutes = _positive(raw, 'error_retry_minutes')
+        self.cycle_deadline_seconds = _positive(raw, 'cycle_deadline_seconds')
+        self.similarity = _similarity_options(raw)
+        self.state_snapshot = _state_snapshot_options(raw)
+        self.circuit_breaker = _circuit_breaker_options(raw)
+
+
+SETTINGS_CLASSES = {
+    "reply_bot": ReplyBotSettings,
+    "trend_bot": TrendBotSettings,
+}
+
+
+def _compile_prompt(container: dict, path: Tuple[str, ...]) -> PromptTemplate:
+    try:
+        return PromptTemplate(container[path[-1]], REQUIRED_PLACEHOLDERS[path])
+    except ConfigError as e:
+        raise ConfigError(f"{'.'.join(path[1:])}: {e}")
+
+
+def _positive(raw: dict, key: str) -> float:
+    value = raw[key]
+    if value <= 0:
+        raise ConfigError(f"{key} pozitif olmalı: {value!r}")
+    return value
+
+
+def _matcher(raw: dict, key: str) -> KeywordMatcher:
+    """Boş liste filtreyi sessizce kapatacağı için kabul edilmez"""
+    if not raw[key]:
+        raise ConfigError(f"{key} en az bir kelime içermeli")
+    return KeywordMatcher(raw[key])
+
+
+def _regions(regions: list) -> List[dict]:
+    if not regions:
+        raise ConfigError("regions en az bir bölge içermeli")
+    names = set()
+    for index, region in enumerate(regions):
+        name = region.get('name')
+        if not isinstance(name, str) or not name or name in names:
+            raise ConfigError(f"regions[{index}].name boş olmayan ve benzersiz bir metin olmalı")
+        names.add(name)
+        unknown = set(region) - {'name', 'trends24', 'twitter_trending'}
+        if unknown:
+            raise ConfigError(f"regions[{index}]: bilinmeyen anahtar(lar): {', '.join(sorted(unknown))}")
+        if not region.get('trends24') and not region.get('twitter_trending'):
+            raise ConfigError(f"regions[{index}] en az bir trend URL'si içermeli")
+        for source in ('trends24', 'twitter_trending'):
+            url = region.get(source)
+            if url is not None and (not isinstance(url, str) or not url.startswith(('http://', 'https://'))):
+                raise ConfigError(f"regions[{index}].{source} geçerli bir URL değil: {url!r}")
+    return [dict(region) for region in regions]
+
+
+def _similarity_options(raw: dict) -> dict:
+    options = dict(raw['similarity'])
+    if not 0 < options['threshold'] <= 1:
+        raise ConfigError("similarity.threshold 0 ile 1 arasında olmalı")
+    return options
+
+
+def _state_snapshot_options(raw: dict) -> dict:
+    options = dict(raw['state_snapshot'])
+    _positive(options, 'max_age_minutes')
+    return options
+
+
+def _model_options(raw: dict) -> dict:
+    options = dict(raw['models'])
+    tiers = options['tiers']
+    if not tiers or not all(isinstance(model, str) and model for model in tiers):
+        raise ConfigError("models.tiers en az bir model adı içermeli")
+    if len(set(tiers)) != len(tiers):
+        raise ConfigError("models.tiers aynı modeli iki kez içeremez")
+    for key in ('latency_budget_seconds', 'timeout_seconds'):
+        _positive(options, key)
+    options['tiers'] = list(tiers)
+    return options
+
+
+def _circuit_breaker_options(raw: dict) -> dict:
+    options = dict(raw['circuit_breaker'])
+    for key in ('window_size', 'min_calls', 'open_seconds'):
+        _positive(options, key)
+    if not 0 < options['failure_rate_threshold'] <= 1:
+        raise ConfigError("circuit_breaker.failure_rate_threshold 0 ile 1 arasında olmalı")
+    if options['min_calls'] > options['window_size']:
+        raise ConfigError("circuit_breaker.min_calls, window_size'dan büyük olamaz")
+    return options
+
+
+def _merge(defaults: dict, overrides: dict, path: str = "") -> dict:
+    """Varsayılanların üzerine dosyadaki değerleri yazar ve tipleri doğrular"""
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        key_path = f"{path}.{key}" if path else key
+        if key not in defaults:
+            raise ConfigError(f"bilinmeyen anahtar: {key_path}")
+        default = defaults[key]
+        if isinstance(default, dict):
+            if not isinstance(value, dict):
+                raise ConfigError(f"{key_path} bir nesne olmalı")
+            merged[key] = _merge(default, value, key_path)
+        elif isinstance(default, list) and default and isinstance(default[0], dict):
+            if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+                raise ConfigError(f"{key_path} nesnelerden oluşan bir liste olmalı")
+            merged[key] = copy.deepcopy(value)
+        elif isinstance(default, list):
+            if not isinstance(value, list) or not all(isinstance(item, str) and item for item in value):
+                raise ConfigError(f"{key_path} boş olmayan metinlerden oluşan bir liste olmalı")
+            merged[key] = list(value)
+        elif isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise ConfigError(f"{key_path} true veya false olmalı")
+            merged[key] = value
+        elif isinstance(default, (int, float)):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ConfigError(f"{key_path} sayı olmalı")
+            merged[key] = value
+        elif isinstance(default, str):
+            if not isinstance(value, str) or not value.strip():
+                raise ConfigError(f"{key_path} boş olmayan bir metin olmalı")
+            merged[key] = value
+    return merged
+
+
+def _flatten(data: dict, prefix: str = "") -> Dict[str, object]:
+    flat = {}
+    for key, value in data.items():
+        key_path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, key_path))
+        else:
+            flat[key_path] = value
+    return flat
+
+
+def _short(value: object, limit: int = 60) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def describe_changes(old: dict, new: dict) -> List[str]:
+    """İki yapılandırma arasındaki farkları okunabilir satırlar olarak döndürür"""
+    old_flat, new_flat = _flatten(old), _flatten(new)
+    changes = []
+    for key in sorted(set(old_flat) | set(new_flat)):
+        before, after = old_flat.get(key), new_flat.get(key)
+        if before == after:
+            continue
+        if isinstance(before, list) and isinstance(after, list):
+            added = [item for item in after if item not in before]
+            removed = [item for item in before if item not in after]
+            parts = []
+            if added:
+                parts.append(f"+{added}")
+            if removed:
+                parts.append(f"-{removed}")
+            changes.append(f"{key}: {' '.join(parts) if parts else 'sıra değişti'}")
+        else:
+            changes.append(f"{key}: {_short(before)} -> {_short(after)}")
+    return changes
+
+
+def load_section(section: str, path: str) -> Tuple[dict, object]:
+    """Dosyayı okuyup bölümü doğrular ve derler; (ham, derlenmiş) döndürür"""
+    overrides = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ConfigError(f"JSON okunamadı: {e}")
+        if not isinstance(data, dict):
+            raise ConfigError("yapılandırma kökü bir nesne olmalı")
+        unknown = set(data) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise ConfigError(f"bilinmeyen bölüm(ler): {', '.join(sorted(unknown))}")
+        overrides = data.get(section, {})
+        if not isinstance(overrides, dict):
+            raise ConfigError(f"{section} bir nesne olmalı")
+    raw = _merge(DEFAULT_CONFIG[section], overrides)
+    try:
+        compiled = SETTINGS_CLASSES[section](raw)
+    except KeyError as e:
+        raise ConfigError(f"eksik anahtar: {e}")
+    return raw, compiled
+
+
+class ConfigWatcher:
+    """Yapılandırma dosyasını izler, değişince doğrulayıp derler ve atomik olarak değiştirir"""
+
+    def __init__(self, section: str, path: Optional[str] = None, poll_seconds: float = DEFAULT_POLL_SECONDS):
+        self.section = section
+        self.path = path or os.getenv('BOT_CONFIG_PATH', DEFAULT_CONFIG_PATH)
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._signature = None
+
+        # Önce varsayılanlarla başla, sonra dosya varsa onu yükle
+        self._raw = copy.deepcopy(DEFAULT_CONFIG[section])
+        self.current = SETTINGS_CLASSES[section](self._raw)
+        self.check()
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def check(self) -> bool:
+        """Dosya değiştiyse yeniden yükler; yeni yapılandırma devreye girdiyse True döner"""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        return self.reload()
+
+    def reload(self) -> bool:
+        """Dosyayı yükler; geçersizse eski yapılandırma kullanılmaya devam eder"""
+        try:
+            raw, compiled = load_section(self.section, self.path)
+        except (ConfigError, OSError) as e:
+            logger.error(f"❌ Yapılandırma geçersiz, eski ayarlar kullanılmaya devam ediyor ({self.path}): {e}")
+            return False
+
+        with self._lock:
+            changes = describe_changes(self._raw, raw)
+            if not changes:
+                return False
+            self._raw = raw
+            # Tek atama: okuyan thread'ler ya eski ya yeni nesneyi görür, yarım halini görmez
+            self.current = compiled
+
+        logger.info(f"🔄 Yapılandırma yeniden yüklendi ({self.section}), {len(changes)} değişiklik:")
+        for change in changes:
+            logger.info(f"   • {change}")
+        return True
+
+    def start(self):
+        """Arka planda dosyayı izlemeye başla"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._watch, name=f"config-watcher-{self.section}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"❌ Yapılandırma izleme hatası: {e}")
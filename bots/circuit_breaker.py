@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Devre Kesici (Circuit Breaker)
+Her dış kaynak (trends24.in, twitter-trending.com, Groq...) için ayrı bir devre tutar.
+Son çağrılardaki hata oranı eşiği aşınca devre açılır ve çağrılar timeout beklenmeden
+hemen atlanır. Belirli bir süre sonra tek bir deneme isteğine izin verilir (yarı açık);
+başarılı olursa devre kapanır, başarısız olursa tekrar açılır.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_OPTIONS = {
+    # Son kaç çağrıya bakılacağı
+    "window_size": 10,
+    # Hata oranı hesaplanmadan önce gereken en az çağrı sayısı
+    "min_calls": 3,
+    # Bu oranın üstünde hata varsa devre açılır
+    "failure_rate_threshold": 0.5,
+    # Devre açıldıktan kaç saniye sonra deneme isteği yapılacağı
+    "open_seconds": 180,
+}
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken yapılan çağrı atlandığında fırlatılır"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} devresi açık, {retry_in:.0f} sn sonra tekrar denenecek")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Tek bir dış kaynak için kapalı / açık / yarı açık durumlu devre kesici"""
+
+    def __init__(self, name: str, options: Callable[[], dict] = None, metrics=None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._options = options or (lambda: DEFAULT_OPTIONS)
+        self.metrics = metrics
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._results = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._publish_state()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _option(self, key: str):
+        return self._options().get(key, DEFAULT_OPTIONS[key])
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and self.clock() - self._opened_at >= self._option('open_seconds'):
+            self._transition(HALF_OPEN)
+
+    def _transition(self, state: str):
+        previous, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = self.clock()
+            self._probe_in_flight = False
+            failures = sum(1 for ok in self._results if not ok)
+            logger.warning(
+                f"🔌 Devre açıldı: {self.name} ({failures}/{len(self._results)} hata) - "
+                f"{self._option('open_seconds'):.0f} sn boyunca çağrılar atlanacak"
+            )
+            if self.metrics:
+                self.metrics.incr(f"circuit.{self.name}.opened")
+        elif state == HALF_OPEN:
+            logger.info(f"🔌 Devre yarı açık: {self.name} - deneme isteğine izin veriliyor")
+        elif state == CLOSED:
+            self._results.clear()
+            if previous != CLOSED:
+                logger.info(f"✅ Devre kapandı: {self.name} - kaynak tekrar çalışıyor")
+        self._publish_state()
+
+    def _publish_state(self):
+        if self.metrics:
+            self.metrics.gauge(f"circuit.{self.name}.state", self._state)
+
+    def allow(self) -> bool:
+        """Çağrı yapılabilir mi? Yarı açık durumda aynı anda tek deneme isteğine izin verir"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self._option('open_seconds') - self.clock())
+
+    def record_success(self):
+        with self._lock:
+            if self.metrics:
+                self.metrics.incr(f"circuit.{self.name}.successes")
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+                return
+            self._record(True)
+
+    def record_failure(self):
+        with self._lock:
+            if self.metrics:
+                self.metrics.incr(f"circuit.{self.name}.failures")
+            if self._state == HALF_OPEN:
+                # Deneme isteği de başarısız, tekrar aç
+                self._transition(OPEN)
+                return
+            self._record(False)
+            if self._state == CLOSED and len(self._results) >= self._option('min_calls'):
+                failures = sum(1 for ok in self._results if not ok)
+                if failures / len(self._results) >= self._option('failure_rate_threshold'):
+                    self._transition(OPEN)
+
+    def _record(self, ok: bool):
+        self._results.append(ok)
+        while len(self._results) > self._option('window_size'):
+            self._results.popleft()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """func'ı devre üzerinden çağırır; devre açıksa CircuitOpenError fırlatır"""
+        if not self.allow():
+            if self.metrics:
+                self.metrics.incr(f"circuit.{self.name}.rejected")
+            raise CircuitOpenError(self.name, self.retry_in())
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+class CircuitBreakerRegistry:
+    """Kaynak adına göre devre kesicileri oluşturur ve saklar"""
+
+    def __init__(self, options: Callable[[], dict] = None, metrics=None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._options = options
+        self.metrics = metrics
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name, self._options, self.metrics, self.clock)
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
+
+    def log_states(self, log: Optional[logging.Logger] = None):
+        """Kapalı olmayan devreleri loglar"""
+        log = log or logger
+        for name, state in sorted(self.states().items()):
+            if state != CLOSED:
+                log.info(f"🔌 Devre durumu: {name} = {state}")
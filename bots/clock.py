@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Saat Soyutlaması
+Bot döngüleri zamanı ve beklemeleri doğrudan time modülünden değil, enjekte edilen bir
+saatten alır. Normal çalışmada SystemClock gerçek zamanı kullanır; simülasyonda
+VirtualClock beklemeleri anında "geçirir", böylece bir günlük çalışma saniyeler içinde
+denenebilir (bkz. simulation.py).
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+class SimulationFinished(BaseException):
+    """Sanal saat simülasyon süresinin sonuna geldi; bot döngüsünü sonlandırmak için BaseException"""
+
+
+class SystemClock:
+    """Gerçek saat (time.time / time.monotonic / time.sleep)"""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float):
+        # time.sleep çağrı anında aranır (HTTP oynatma modu onu no-op yapabiliyor)
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Beklemeleri gerçekten beklemeden ilerleyen sanal saat"""
+
+    def __init__(self, start: Optional[float] = None, duration: Optional[float] = None):
+        self.started_at = start if start is not None else time.time()
+        self.ends_at = self.started_at + duration if duration is not None else None
+        self._now = self.started_at
+        self._lock = threading.Lock()
+        # (başlangıç zamanı, süre) - beklemelerin dökümü
+        self.sleeps: List[Tuple[float, float]] = []
+
+    def time(self) -> float:
+        with self._lock:
+            return self._now
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._now - self.started_at
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time())
+
+    def elapsed(self) -> float:
+        return self.monotonic()
+
+    def sleep(self, seconds: float):
+        """Saati ileri alır; simülasyon süresi dolduysa SimulationFinished fırlatır"""
+        seconds = max(0.0, seconds)
+        with self._lock:
+            self.sleeps.append((self._now, seconds))
+        self.advance(seconds)
+
+    def advance(self, seconds: float):
+        """Bekleme dışında geçen süreyi (ör. sahte ağ gecikmesi) ekler"""
+        with self._lock:
+            self._now += max(0.0, seconds)
+            finished = self.ends_at is not None and self._now >= self.ends_at
+        if finished:
+            raise SimulationFinished()
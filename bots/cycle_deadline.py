@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Döngü Süre Sınırı
+Bir bot döngüsüne (trend toplama + üretim + tweet atma + aradaki bekleme) toplam bir süre
+bütçesi verilir. Her ağ isteği zaman aşımını bu bütçeden kalan süreyle sınırlar; süre
+dolunca yeni istek başlatılmaz, süren istekler iptal edilir ve döngü DeadlineExceeded ile
+biter. Her aşamanın harcadığı süre tutulur; bütçe aşılırsa hangi aşamanın süreyi
+tükettiği yapılandırılmış bir kayıt olarak yazılır.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+# Kalan süre bundan azsa yeni istek başlatılmaz (anlamlı bir cevap beklenemez)
+MIN_TIMEOUT_SECONDS = 1.0
+
+
+class DeadlineExceeded(Exception):
+    """Döngü bütçesi doldu; stage süreyi tüketen aşama"""
+
+    def __init__(self, stage: str):
+        super().__init__(f"döngü süresi doldu ({stage})")
+        self.stage = stage
+
+
+class CycleDeadline:
+    """Tek bir döngünün süre bütçesi ve aşama süreleri"""
+
+    def __init__(self, budget_seconds: float, clock=None, min_timeout: float = MIN_TIMEOUT_SECONDS):
+        self.clock = clock or SystemClock()
+        self.budget_seconds = budget_seconds
+        self.min_timeout = min_timeout
+        self.started = self.clock.monotonic()
+        self.expires_at = self.started + budget_seconds
+        self._lock = threading.Lock()
+        # aşama -> harcanan süre (aynı aşama birden fazla kez girilirse toplanır)
+        self.stages: Dict[str, float] = {}
+        self.current_stage: Optional[str] = None
+        # Bütçeyi tüketen (süre dolduğunda çalışan) aşama
+        self.exhausted_by: Optional[str] = None
+
+    def elapsed(self) -> float:
+        return self.clock.monotonic() - self.started
+
+    def remaining(self) -> float:
+        return self.expires_at - self.clock.monotonic()
+
+    def _exceeded(self) -> DeadlineExceeded:
+        stage = self.current_stage or 'cycle'
+        with self._lock:
+            if self.exhausted_by is None:
+                self.exhausted_by = stage
+        return DeadlineExceeded(stage)
+
+    def timeout(self, default: float) -> float:
+        """İstek zaman aşımı: varsayılan ile kalan süreden küçüğü; süre dolduysa DeadlineExceeded"""
+        remaining = self.remaining()
+        if remaining < self.min_timeout:
+            raise self._exceeded()
+        return min(default, remaining)
+
+    def check(self):
+        if self.remaining() <= 0:
+            raise self._exceeded()
+
+    def fits(self, seconds: float) -> bool:
+        """Önümüzdeki seconds saniye bütçeye sığıyor mu"""
+        return seconds < self.remaining()
+
+    def ensure(self, seconds: float):
+        """Önümüzdeki seconds saniye bütçeye sığmıyorsa DeadlineExceeded"""
+        if not self.fits(seconds):
+            raise self._exceeded()
+
+    def sleep(self, seconds: float):
+        """Bekleme bütçeyi aşacaksa hiç beklemeden DeadlineExceeded fırlatır"""
+        self.ensure(seconds)
+        self.clock.sleep(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Aşamanın süresini ölçer; süre bu aşamada dolduysa bütçeyi tüketen aşama olarak işaretler
+
+        Aşamanın sonucu (ör. atılmış tweet) kaybolmasın diye burada exception fırlatılmaz;
+        sonraki timeout() / check() çağrısı DeadlineExceeded fırlatır.
+        """
+        previous = self.current_stage
+        self.current_stage = name
+        started = self.clock.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + self.clock.monotonic() - started
+            self.current_stage = previous
+        if self.remaining() <= 0:
+            with self._lock:
+                if self.exhausted_by is None:
+                    self.exhausted_by = name
+
+    def report(self) -> dict:
+        elapsed = self.elapsed()
+        with self._lock:
+            stages = {name: round(seconds, 3) for name, seconds in self.stages.items()}
+            exhausted_by = self.exhausted_by
+        return {
+            'budget_seconds': self.budget_seconds,
+            'elapsed_seconds': round(elapsed, 3),
+            'over_budget': exhausted_by is not None,
+            'exhausted_by': exhausted_by,
+            'stages': stages,
+        }
+
+
+def record_cycle(report: dict, metrics=None, path: Optional[str] = None, cycle: Optional[int] = None):
+    """Aşama sürelerini metriklere yazar; bütçe aşıldıysa kaydı JSONL dosyasına ekler"""
+    if metrics:
+        metrics.observe('cycle.seconds', report['elapsed_seconds'])
+        for name, seconds in report['stages'].items():
+            metrics.observe(f'cycle.stage.{name}.seconds', seconds)
+        if report['over_budget']:
+            metrics.incr('cycle.over_budget')
+            metrics.incr(f"cycle.over_budget.{report['exhausted_by']}")
+
+    if not report['over_budget']:
+        return
+    stages = ', '.join(f"{name} {seconds:.1f} sn" for name, seconds in report['stages'].items())
+    logger.warning(
+        f"⏰ Döngü bütçesi aşıldı: {report['budget_seconds']:g} sn bütçe, süreyi tüketen aşama "
+        f"'{report['exhausted_by']}' ({stages})"
+    )
+    if not path:
+        return
+    record = dict(report, at=time.strftime('%Y-%m-%d %H:%M:%S'), cycle=cycle)
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    except OSError as e:
+        logger.warning(f"Döngü kaydı yazılamadı: {e}")
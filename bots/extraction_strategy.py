@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Uyarlanabilir Trend Çıkarma Sırası
+Bir trend sayfasından trend çıkarmanın birden fazla yolu var (JSON-LD, Playwright,
+tablo taraması...). Site tasarımı değişince her döngüde çalışmayan yolları denemek
+yerine, her yolun başarı oranı ve süresi tutulur ve geçmişte en iyi sonuç veren yol
+önce denenir. Arada bir daha ucuz yollar tekrar denenir; tüm yollar boş dönmeye
+başlarsa uyarı verilir.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Süre için üssel hareketli ortalama katsayısı
+LATENCY_ALPHA = 0.3
+
+
+class ExtractionPath:
+    """Tek bir çıkarma yolu ve istatistikleri"""
+
+    def __init__(self, name: str, func: Callable[..., List[str]], prior_latency: float, from_content: bool = True):
+        self.name = name
+        self.func = func
+        # Hiç denenmemiş yol için varsayılan süre tahmini (saniye); ucuzluk sırası da buna göre
+        self.prior_latency = prior_latency
+        # Sonuç sadece verilen sayfa içeriğinden mi çıkıyor (False: sayfayı kendisi yeniden yükler)
+        self.from_content = from_content
+        self.attempts = 0
+        self.successes = 0
+        self.avg_latency: Optional[float] = None
+
+    @property
+    def success_rate(self) -> float:
+        # Laplace düzeltmesi: az denemede tek sonuç sırayı bozmasın
+        return (self.successes + 1) / (self.attempts + 2)
+
+    def expected_cost(self) -> float:
+        """Başarılı bir sonuç için beklenen süre (düşük olan önce denenir)"""
+        latency = self.avg_latency if self.avg_latency is not None else self.prior_latency
+        return latency / self.success_rate
+
+    def record(self, found: bool, latency: float):
+        self.attempts += 1
+        if found:
+            self.successes += 1
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency = LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.avg_latency
+
+    def to_dict(self) -> dict:
+        return {'attempts': self.attempts, 'successes': self.successes, 'avg_latency': self.avg_latency}
+
+    def load_dict(self, data: dict):
+        self.attempts = int(data.get('attempts', 0))
+        self.successes = int(data.get('successes', 0))
+        self.avg_latency = data.get('avg_latency')
+
+
+class StrategySelector:
+    """Bir kaynak için çıkarma yollarını geçmiş performansa göre sıralar ve çalıştırır"""
+
+    def __init__(self, source: str, paths: List[ExtractionPath], metrics=None,
+                 explore_probability: float = 0.1, alert_after: int = 3, rng: random.Random = None):
+        self.source = source
+        self.paths = paths
+        self.metrics = metrics
+        self.explore_probability = explore_probability
+        self.alert_after = alert_after
+        self.rng = rng or random.Random()
+        # Art arda kaç toplama döngüsünde bu kaynağın hiçbir sayfasından trend çıkmadı
+        self.zero_streak = 0
+        # Bu döngüde parse edilen ve trend bulunan sayfa sayısı (end_cycle ile sıfırlanır)
+        self._cycle_parsed = 0
+        self._cycle_found = 0
+        # Bölgeler paralel çekildiği için istatistik güncellemeleri kilitli
+        self._lock = threading.Lock()
+
+    def order(self) -> List[ExtractionPath]:
+        """Denenecek sıra: beklenen maliyete göre, ara sıra daha ucuz bir yol başa alınır"""
+        with self._lock:
+            ordered = sorted(self.paths, key=lambda path: path.expected_cost())
+            explore = self.rng.random() < self.explore_probability
+        best = ordered[0]
+        cheaper = [path for path in ordered[1:] if path.prior_latency < best.prior_latency]
+        if cheaper and explore:
+            probe = self.rng.choice(cheaper)
+            ordered.remove(probe)
+            ordered.insert(0, probe)
+            logger.debug(f"{self.source}: daha ucuz yol tekrar deneniyor ({probe.name})")
+        return ordered
+
+    def run(self, *args) -> Tuple[List[str], Optional[str]]:
+        """Yolları sırayla dener; ilk boş olmayan sonucu ve yolun adını döndürür"""
+        for path in self.order():
+            started = time.perf_counter()
+            try:
+                trends = path.func(*args) or []
+            except Exception as e:
+                logger.warning(f"{self.source}: '{path.name}' yolu hata verdi: {e}")
+                trends = []
+            latency = time.perf_counter() - started
+            with self._lock:
+                path.record(bool(trends), latency)
+                self._publish(path, bool(trends), latency)
+                if trends:
+                    self._cycle_parsed += 1
+                    self._cycle_found += 1
+                    return trends, path.name
+        with self._lock:
+            self._cycle_parsed += 1
+        return [], None
+
+    def end_cycle(self):
+        """Toplama döngüsü bitti: bu döngüde parse edilen sayfaların hiçbirinden trend çıkmadıysa boş döngü sayılır
+
+        Aynı kaynağın birden fazla bölge sayfası tek döngü sayılır; hiç sayfa parse edilmediyse
+        (indirme hatası, parse hafızası isabeti) sayaç değişmez.
+        """
+        with self._lock:
+            parsed, found = self._cycle_parsed, self._cycle_found
+            self._cycle_parsed = self._cycle_found = 0
+            if not parsed:
+                return
+            if found:
+                self._recovered()
+            else:
+                self._all_empty()
+
+    def from_content(self, name: Optional[str]) -> bool:
+        """Adı verilen yolun sonucu sayfa içeriğine mi bağlı (içerik özetiyle saklanabilir mi)"""
+        return any(path.name == name and path.from_content for path in self.paths)
+
+    def _publish(self, path: ExtractionPath, found: bool, latency: float):
+        if not self.metrics:
+            return
+        prefix = f"extraction.{self.source}.{path.name}"
+        self.metrics.incr(f"{prefix}.attempts")
+        if found:
+            self.metrics.incr(f"{prefix}.successes")
+        self.metrics.observe(f"{prefix}.latency", latency)
+
+    def _recovered(self):
+        if self.zero_streak >= self.alert_after:
+            logger.info(f"✅ {self.source}: trend çıkarma tekrar çalışıyor ({self.zero_streak} boş döngüden sonra)")
+        self.zero_streak = 0
+        if self.metrics:
+            self.metrics.gauge(f"extraction.{self.source}.zero_streak", 0)
+
+    def _all_empty(self):
+        self.zero_streak += 1
+        if self.metrics:
+            self.metrics.gauge(f"extraction.{self.source}.zero_streak", self.zero_streak)
+        if self.zero_streak % self.alert_after == 0:
+            logger.error(
+                f"🚨 {self.source}: {self.zero_streak} döngüdür hiçbir çıkarma yolu trend bulamadı "
+                f"({', '.join(path.name for path in self.paths)}) - site tasarımı değişmiş olabilir!"
+            )
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {path.name: path.to_dict() for path in self.paths}
+
+    def load_stats(self, stats: Dict[str, dict]):
+        with self._lock:
+            for path in self.paths:
+                if path.name in stats:
+                    path.load_dict(stats[path.name])
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Groq İstemcisi
+İki bot'un ortak kullandığı Groq chat completion istemcisi. İki mod var:
+- tam (full): cevabın tamamı gelince döner, uzunsa cümle sınırından kısaltılır,
+- akış (stream): SSE parçaları geldikçe metin birikir; tweet sınırı aşılınca son
+  cümle sınırından kesilir ve bağlantı kapatılır, kalan token'lar beklenmez.
+Her iki mod için "kullanılabilir metne kadar geçen süre" ve boşa giden (kesilip
+atılan) completion token'ları ölçülür ve karşılaştırılabilir olarak raporlanır.
+
+Model kademeleri: birden fazla model verilirse önce ilki denenir. Gecikme bütçesi
+içinde cevap gelmezse (veya hata dönerse) sıradaki, daha hızlı model de başlatılır;
+ilk gelen geçerli cevap kullanılır, diğeri iptal edilir. Akış modunda iptal bağlantıyı
+hemen kapatır; tam modda süren istek kesilemediği için cevabı geldiğinde atılır.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+import http_cassette
+
+logger = logging.getLogger(__name__)
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+TWEET_LIMIT = 280
+
+FULL = 'full'
+STREAM = 'stream'
+
+# Aynı anda en fazla kaç model isteği (kademe sayısı + iptal edilip biten istekler)
+MAX_PARALLEL_ATTEMPTS = 4
+
+# Cümle sonu: . ! ? … (arkasından boşluk / metin sonu gelirse) veya satır sonu
+_SENTENCE_END = re.compile(r'[.!?…]+(?=\s|$)|\n')
+
+
+def _cut_point(text: str, limit: int) -> Tuple[int, str]:
+    """Kesim noktası ve eklenecek son ek; cümle yoksa kelimeden kesilip '...' eklenir"""
+    if len(text) <= limit:
+        return len(text), ''
+    ends = [match.end() for match in _SENTENCE_END.finditer(text) if match.end() <= limit]
+    # Çok kısa bir ilk cümleyle yetinme; sınırın yarısından önce cümle sonu yoksa kelimeden kes
+    if ends and ends[-1] >= limit // 2:
+        return ends[-1], ''
+    index = text.rfind(' ', 0, limit - 3)
+    return (index if index > 0 else limit - 3), '...'
+
+
+def cut_at_sentence(text: str, limit: int = TWEET_LIMIT) -> str:
+    """Metni sınırı aşmayacak şekilde son cümle sınırından keser"""
+    text = text.strip()
+    index, suffix = _cut_point(text, limit)
+    return text[:index].rstrip() + suffix
+
+
+def _finish(raw: str, char_limit: Optional[int], tokens: float) -> Tuple[str, float, bool]:
+    """(metin, boşa giden token tahmini, kesildi mi) - atılan karakter oranı kadar token boşa gitti"""
+    raw = raw.strip()
+    if not char_limit or not raw:
+        return raw, 0.0, False
+    index, suffix = _cut_point(raw, char_limit)
+    if index >= len(raw):
+        return raw, 0.0, False
+    wasted = tokens * (len(raw) - index) / len(raw) if tokens else 0.0
+    return raw[:index].rstrip() + suffix, wasted, True
+
+
+class Completion:
+    """Groq cevabı ve ölçümleri"""
+
+    def __init__(self, text: str, mode: str, model: str, usable_seconds: float,
+                 completion_tokens: Optional[int], wasted_tokens: float, usage: dict, cut: bool):
+        self.text = text
+        self.mode = mode
+        self.model = model
+        # İstek başından kullanılabilir metnin elde edildiği ana kadar geçen süre
+        self.usable_seconds = usable_seconds
+        self.completion_tokens = completion_tokens
+        # Üretilip kesilerek atılan token'lar (tahmini)
+        self.wasted_tokens = wasted_tokens
+        self.usage = usage
+        self.cut = cut
+
+
+class GroqClient:
+    """Devre kesici üzerinden tam veya akış modunda chat completion"""
+
+    def __init__(self, api_key: str, breakers, metrics=None, session: Optional[requests.Session] = None):
+        self.api_key = api_key
+        self.breakers = breakers
+        self.metrics = metrics
+        self.session = session or requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_ATTEMPTS, thread_name_prefix='groq')
+        self._lock = threading.Lock()
+        # mod -> {'calls', 'usable_seconds', 'wasted_tokens'} (karşılaştırma logu için)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        # model -> {'attempts', 'wins', 'failures', 'cancelled'}
+        self._model_stats: Dict[str, Dict[str, int]] = {}
+
+    def generate(self, messages: List[dict], temperature: float, models: Sequence[str] = (DEFAULT_MODEL,),
+                 latency_budget: Optional[float] = None, max_tokens: int = 200,
+                 char_limit: Optional[int] = TWEET_LIMIT, stream: bool = False, timeout: float = 15,
+                 label: Optional[str] = None, deadline=None, **extra) -> Completion:
+        """Cevabı döndürür; tüm modeller başarısızsa son hatayı (CircuitOpenError, requests hatası) fırlatır.
+
+        models kademe sırasıdır (ilki ana model). latency_budget saniye içinde cevap gelmezse
+        sıradaki model de başlatılır. label verilirse ölçümler mod yerine bu adla tutulur
+        (ör. toplu üretim karşılaştırmayı bozmasın). deadline (CycleDeadline) verilirse zaman
+        aşımı kalan süreyle sınırlanır, süre dolunca süren istekler iptal edilip DeadlineExceeded
+        fırlatılır.
+        """
+        payload = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        payload.update(extra)
+        if stream:
+            payload["stream"] = True
+        started = time.perf_counter()
+        if deadline is not None:
+            timeout = deadline.timeout(timeout)
+        if http_cassette.is_active():
+            # Kayıt/oynatmada hangi modelin başlatılacağı gecikmeye bağlı olmasın (oynatma kaydı tekrarlasın)
+            latency_budget = None
+
+        completion = self._race(models, latency_budget, payload, char_limit, stream, timeout, deadline)
+        completion.usable_seconds = time.perf_counter() - started
+        self._publish(label or completion.mode, completion)
+        return completion
+
+    def _race(self, models: Sequence[str], latency_budget: Optional[float], payload: dict,
+              char_limit: Optional[int], stream: bool, timeout: float, deadline=None) -> Completion:
+        """Modelleri bütçe aşıldıkça (veya hata oldukça) sırayla başlatır; ilk geçerli cevabı döndürür"""
+        pending: Dict[object, Tuple[str, threading.Event]] = {}
+        next_tier = 0
+        last_error: Exception = ValueError("hiçbir model cevap vermedi")
+
+        def start_next():
+            nonlocal next_tier
+            model = models[next_tier]
+            next_tier += 1
+            cancel = threading.Event()
+            future = self._executor.submit(self._attempt, model, payload, char_limit, stream, timeout, cancel)
+            pending[future] = (model, cancel)
+
+        def cancel_pending():
+            for other_model, cancel in pending.values():
+                cancel.set()
+                self._record_model(other_model, 'cancelled')
+
+        start_next()
+        while pending:
+            budget = latency_budget if next_tier < len(models) else None
+            if deadline is not None:
+                remaining = max(0.0, deadline.remaining())
+                budget = remaining if budget is None else min(budget, remaining)
+            done, _ = wait(list(pending), timeout=budget, return_when=FIRST_COMPLETED)
+            if not done:
+                if deadline is not None and deadline.remaining() <= 0:
+                    # Döngü süresi doldu: süren istekleri bırak (akışta bağlantı kapanır)
+                    cancel_pending()
+                    deadline.check()
+                if next_tier < len(models) and latency_budget is not None:
+                    logger.info(f"⏱️ {models[next_tier - 1]} {latency_budget:g} sn içinde cevap vermedi, "
+                                f"{models[next_tier]} de başlatılıyor")
+                    start_next()
+                continue
+
+            for future in done:
+                model, _ = pending.pop(future)
+                try:
+                    completion = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if not completion.text:
+                    last_error = ValueError(f"{model} boş cevap döndü")
+                    self._record_model(model, 'failures')
+                    continue
+                # Kazanan belli: diğer istekleri iptal et
+                cancel_pending()
+                self._record_win(model)
+                if model != models[0]:
+                    logger.info(f"🏁 Cevap yedek modelden geldi: {model}")
+                return completion
+
+            # Bekleyen istek kalmadıysa (hepsi hata verdi) sıradaki modele hemen geç
+            if not pending and next_tier < len(models):
+                logger.warning(f"⚠️ {models[next_tier - 1]} başarısız ({last_error}), {models[next_tier]} deneniyor")
+                start_next()
+        raise last_error
+
+    def _attempt(self, model: str, payload: dict, char_limit: Optional[int], stream: bool, timeout: float,
+                 cancel: Optional[threading.Event]) -> Completion:
+        """Tek modelle tek istek; her modelin kendi devre kesicisi var"""
+        self._record_model(model, 'attempts')
+        started = time.perf_counter()
+        try:
+            response = self.breakers.get(f'groq:{model}').call(self._post, dict(payload, model=model), timeout, stream)
+            if response.status_code != 200:
+                response.close()
+                raise requests.HTTPError(f"{response.status_code} - {response.text[:200]}", response=response)
+            if stream:
+                completion = self._read_stream(response, model, char_limit, started, cancel)
+            else:
+                completion = self._read_full(response, model, char_limit, started)
+                if cancel is not None and cancel.is_set():
+                    raise _Cancelled()
+        except _Cancelled:
+            raise
+        except Exception:
+            self._record_model(model, 'failures')
+            raise
+        if self.metrics:
+            self.metrics.observe(f"groq.model.{_metric_name(model)}.latency", time.perf_counter() - started)
+        return completion
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _post(self, payload: dict, timeout: float, stream: bool = False) -> requests.Response:
+        """429 ve 5xx devre kesici için hata sayılır; diğer hatalar (400 vb.) devreyi etkilemez"""
+        response = self.session.post(GROQ_URL, headers=self._headers(), json=payload, timeout=timeout, stream=stream)
+        if self.metrics:
+            self.metrics.incr('groq.round_trips')
+        if response.status_code == 429 or response.status_code >= 500:
+            raise requests.HTTPError(f"{response.status_code} - {response.text[:200]}", response=response)
+        return response
+
+    def _read_full(self, response: requests.Response, model: str, char_limit: Optional[int],
+                   started: float) -> Completion:
+        result = response.json()
+        usable_seconds = time.perf_counter() - started
+        usage = result.get('usage') or {}
+        completion_tokens = usage.get('completion_tokens')
+        text, wasted, cut = _finish(result['choices'][0]['message']['content'], char_limit, completion_tokens)
+        return Completion(text, FULL, model, usable_seconds, completion_tokens, wasted, usage, cut)
+
+    def _read_stream(self, response: requests.Response, model: str, char_limit: Optional[int],
+                     started: float, cancel: Optional[threading.Event] = None) -> Completion:
+        parts: List[str] = []
+        length = 0
+        chunks = 0
+        usage = {}
+        try:
+            # SSE her zaman UTF-8; Content-Type'ta charset olmayabileceği için satırlar elle çözülür
+            for raw_line in response.iter_lines():
+                if cancel is not None and cancel.is_set():
+                    raise _Cancelled()
+                line = raw_line.decode('utf-8', errors='replace') if isinstance(raw_line, bytes) else raw_line
+                if not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    break
+                chunk = json.loads(data)
+                usage = chunk.get('usage') or (chunk.get('x_groq') or {}).get('usage') or usage
+                choices = chunk.get('choices') or []
+                delta = (choices[0].get('delta') or {}).get('content') if choices else None
+                if not delta:
+                    continue
+                chunks += 1
+                parts.append(delta)
+                length += len(delta)
+                # Sınır aşıldı: kalan token'ları bekleme, bağlantıyı kapat (kesim aşağıda yapılır)
+                if char_limit and length > char_limit and len(''.join(parts).strip()) > char_limit:
+                    break
+        finally:
+            response.close()
+
+        usable_seconds = time.perf_counter() - started
+        # Kesilen akışta usage gelmez; her SSE parçası yaklaşık bir token
+        completion_tokens = usage.get('completion_tokens') or chunks
+        text, wasted, cut = _finish(''.join(parts), char_limit, completion_tokens)
+        return Completion(text, STREAM, model, usable_seconds, completion_tokens, wasted, usage, cut)
+
+    def _publish(self, label: str, completion: Completion):
+        with self._lock:
+            totals = self._totals.setdefault(label, {'calls': 0, 'usable_seconds': 0.0, 'wasted_tokens': 0.0})
+            totals['calls'] += 1
+            totals['usable_seconds'] += completion.usable_seconds
+            totals['wasted_tokens'] += completion.wasted_tokens
+        if not self.metrics:
+            return
+        prefix = f"groq.{label}"
+        self.metrics.observe(f"{prefix}.usable_seconds", completion.usable_seconds)
+        self.metrics.observe(f"{prefix}.wasted_tokens", completion.wasted_tokens)
+        if completion.completion_tokens:
+            self.metrics.observe(f"{prefix}.completion_tokens", completion.completion_tokens)
+        if completion.cut:
+            self.metrics.incr(f"{prefix}.cut")
+
+    def _record_model(self, model: str, outcome: str):
+        with self._lock:
+            stats = self._model_stats.setdefault(model, {'attempts': 0, 'wins': 0, 'failures': 0, 'cancelled': 0})
+            stats[outcome] += 1
+        if self.metrics:
+            self.metrics.incr(f"groq.model.{_metric_name(model)}.{outcome}")
+
+    def _record_win(self, model: str):
+        self._record_model(model, 'wins')
+        if self.metrics:
+            with self._lock:
+                stats = self._model_stats[model]
+                win_rate = stats['wins'] / stats['attempts'] if stats['attempts'] else 0.0
+            self.metrics.gauge(f"groq.model.{_metric_name(model)}.win_rate", round(win_rate, 3))
+
+    def model_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._model_stats.items()}
+
+    def log_comparison(self, log: Optional[logging.Logger] = None):
+        """Akış ve tam modun ortalama kullanılabilir metin süresi ve boşa giden token'larını loglar"""
+        log = log or logger
+        with self._lock:
+            averages = {
+                mode: (totals['usable_seconds'] / totals['calls'], totals['wasted_tokens'] / totals['calls'], totals['calls'])
+                for mode, totals in self._totals.items() if totals['calls']
+            }
+        if not averages:
+            return
+        parts = [f"{mode}: ort {usable:.2f} sn, {wasted:.1f} boşa token ({calls} istek)"
+                 for mode, (usable, wasted, calls) in sorted(averages.items())]
+        line = " | ".join(parts)
+        if FULL in averages and STREAM in averages:
+            saved = averages[FULL][0] - averages[STREAM][0]
+            line += f" | akış {saved:+.2f} sn daha hızlı"
+        log.info(f"⚡ Groq: {line}")
+        models = self.model_stats()
+        if len(models) > 1:
+            parts = [f"{model}: {stats['wins']}/{stats['attempts']} kazandı, {stats['failures']} hata, "
+                     f"{stats['cancelled']} iptal" for model, stats in models.items()]
+            log.info(f"🏁 Groq modelleri: {' | '.join(parts)}")
+
+
+class _Cancelled(Exception):
+    """Başka model önce cevap verdiği için istek iptal edildi"""
+
+
+def _metric_name(model: str) -> str:
+    # Metrik anahtarlarında nokta ayraç olarak kullanılıyor
+    return model.replace('.', '_')
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP Kayıt / Tekrar Oynatma (Cassette)
+Performans ölçümlerini karşılaştırılabilir yapmak için bot'ların yaptığı tüm HTTP
+isteklerini (trend sayfaları, Groq, Twitter arama/tweet) bir dosyaya kaydeder ve
+daha sonra internete çıkmadan aynı sırayla geri oynatır.
+
+Kullanım (bots/ klasöründen):
+    BOT_HTTP_MODE=record BOT_HTTP_CASSETTE=../logs/gun1.jsonl python3 trend_tweet_bot.py
+    BOT_HTTP_MODE=replay BOT_HTTP_CASSETTE=../logs/gun1.jsonl python3 trend_tweet_bot.py
+
+Kayıt sırasında kullanılan random seed dosyaya yazılır; tekrar oynatmada aynı seed
+kullanıldığı için aynı trendler seçilir ve aynı istekler yapılır. Tekrar oynatmada
+time.sleep beklemez, kayıt bitince (tüm istekler oynatılınca veya kayıttaki son döngü
+bitince) bot durur ve döngü başına süre raporu loglanır. Model kademeleri arasındaki
+gecikme yarışı bu modlarda kapalıdır (yedek model sadece hata olursa denenir), yoksa
+kayıt ve oynatma farklı isteklere yol açar.
+Akış (SSE) cevapları kayıt sırasında sonuna kadar okunup saklanır; oynatmada aynı
+parçalar sırayla verilir.
+
+Kayıt ve oynatma sırasında benzerlik indeksi ve durum dosyası gerçek data/ dosyaları
+yerine geçici bir klasörde tutulur (bkz. scratch_path): iki çalışma da boş başlar, aynı
+kararları verir ve gerçek dosyalara dokunmaz.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+# Kaydedilmeyecek response header'ları
+SKIPPED_HEADERS = {'set-cookie', 'content-encoding', 'transfer-encoding'}
+
+# Şu an etkin olan cassette (kapalıysa None)
+ACTIVE = None
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Tekrar oynatmada kaydı olmayan bir istek yapıldığında fırlatılır (ağ hatası gibi davranır)"""
+
+
+class CassetteExhausted(BaseException):
+    """Kayıttaki tüm istekler oynatıldı; bot döngüsünü sonlandırmak için BaseException"""
+
+
+def _prepared_url(method: str, url: str, params) -> str:
+    return requests.Request(method.upper(), url, params=params).prepare().url
+
+
+def _body_digest(kwargs: dict) -> str:
+    if kwargs.get('json') is not None:
+        body = json.dumps(kwargs['json'], sort_keys=True, ensure_ascii=False).encode('utf-8')
+    else:
+        data = kwargs.get('data')
+        if data is None:
+            return ''
+        body = data if isinstance(data, bytes) else str(data).encode('utf-8')
+    return hashlib.sha1(body).hexdigest()[:16]
+
+
+def request_key(method: str, url: str, kwargs: dict) -> Tuple[str, str, str]:
+    """İsteği eşleştirmek için anahtar: (method, parametreli URL, gövde özeti)"""
+    return method.upper(), _prepared_url(method, url, kwargs.get('params')), _body_digest(kwargs)
+
+
+class Cassette:
+    """Tek bir kayıt dosyası için record / replay durumu"""
+
+    def __init__(self, mode: str, path: str, bot_name: str):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Geçersiz BOT_HTTP_MODE: {mode!r} (record veya replay olmalı)")
+        self.mode = mode
+        self.path = path
+        self.bot_name = bot_name
+        self._lock = threading.Lock()
+        self._original_request = None
+        self._original_sleep = None
+        self._file = None
+        self._exchanges: Dict[Tuple[str, str, str], deque] = defaultdict(deque)
+        self._remaining = 0
+        self.recorded = 0
+        self.served = 0
+        self.misses = 0
+        self.cycle_marks: List[Tuple[int, float]] = []
+        # Kayıttaki son döngü numarası (oynatma bundan sonraki döngüye geçince durur)
+        self.last_cycle: Optional[int] = None
+        self.started_at = time.perf_counter()
+        self.seed = None
+        # Benzerlik indeksi / durum dosyası gibi kalıcı dosyalar için geçici klasör
+        self.scratch_dir = tempfile.mkdtemp(prefix=f'{bot_name}_cassette_')
+
+    # --- Kurulum ---
+
+    def install(self):
+        if self.mode == RECORD:
+            self.seed = random.randrange(2 ** 32)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({'type': 'header', 'bot': self.bot_name, 'seed': self.seed,
+                         'created_at': time.strftime('%Y-%m-%d %H:%M:%S')})
+        else:
+            self._load()
+            # Tekrar oynatmada beklemeye gerek yok, olabildiğince hızlı çalışsın
+            self._original_sleep = time.sleep
+            time.sleep = lambda seconds: None
+        random.seed(self.seed)
+
+        self._original_request = requests.Session.request
+        cassette = self
+
+        def request(session, method, url, **kwargs):
+            return cassette._handle(session, method, url, kwargs)
+
+        requests.Session.request = request
+        logger.info(f"📼 HTTP {self.mode} modu açık: {self.path} (seed={self.seed})")
+
+    def uninstall(self):
+        if self._original_request is not None:
+            requests.Session.request = self._original_request
+            self._original_request = None
+        if self._original_sleep is not None:
+            time.sleep = self._original_sleep
+            self._original_sleep = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        shutil.rmtree(self.scratch_dir, ignore_errors=True)
+        self.report()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry['type'] == 'header':
+                    self.seed = entry['seed']
+                elif entry['type'] == 'exchange':
+                    key = (entry['method'], entry['url'], entry['body'])
+                    self._exchanges[key].append(entry)
+                    self._remaining += 1
+                elif entry['type'] == 'cycle':
+                    self.last_cycle = max(self.last_cycle or 0, entry['n'])
+        logger.info(f"📼 {self._remaining} kayıtlı HTTP isteği yüklendi")
+
+    # --- Kayıt ---
+
+    def _write(self, entry: dict):
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def _handle(self, session, method, url, kwargs):
+        key = request_key(method, url, kwargs)
+        if self.mode == REPLAY:
+            return self._replay(key)
+
+        started = time.perf_counter()
+        response = self._original_request(session, method, url, **kwargs)
+        self._write({
+            'type': 'exchange',
+            'method': key[0],
+            'url': key[1],
+            'body': key[2],
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in SKIPPED_HEADERS},
+            'encoding': response.encoding,
+            'content': base64.b64encode(response.content).decode('ascii'),
+            'elapsed': round(time.perf_counter() - started, 4),
+        })
+        self.recorded += 1
+        return response
+
+    def mark_cycle(self, number: int):
+        """Döngü başlangıcını işaretler (kayıtta dosyaya, oynatmada süre ölçümü için)
+
+        Oynatmada kayıttaki son döngü bittiyse CassetteExhausted fırlatılır; kayıtta kullanılıp
+        oynatmada istenmeyen istekler kalsa bile (ör. yavaş modelin yerine başlatılan yedek
+        model) bot kaydı olmayan döngüleri çalıştırmaya devam etmez.
+        """
+        if self.mode == REPLAY and self.last_cycle is not None and number > self.last_cycle:
+            raise CassetteExhausted()
+        now = time.perf_counter()
+        with self._lock:
+            self.cycle_marks.append((number, now))
+        if self.mode == RECORD:
+            self._write({'type': 'cycle', 'n': number, 'at': time.strftime('%Y-%m-%d %H:%M:%S')})
+
+    # --- Tekrar oynatma ---
+
+    def _replay(self, key: Tuple[str, str, str]) -> requests.Response:
+        with self._lock:
+            if self._remaining == 0:
+                raise CassetteExhausted()
+            queue = self._exchanges.get(key)
+            if not queue:
+                self.misses += 1
+                raise CassetteMiss(f"Kayıtta yok: {key[0]} {key[1]}")
+            entry = queue.popleft()
+            self._remaining -= 1
+            self.served += 1
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry['encoding']
+        response.url = key[1]
+        response._content = base64.b64decode(entry['content'])
+        # İçerik bellekte; akış (stream=True) isteklerinde iter_lines/iter_content bundan okur
+        response._content_consumed = True
+        return response
+
+    def report(self):
+        """Kayıt/oynatma özetini ve döngü sürelerini loglar"""
+        total = time.perf_counter() - self.started_at
+        if self.mode == RECORD:
+            logger.info(f"📼 HTTP kaydı bitti: {total:.2f} sn, {self.recorded} istek kaydedildi")
+        else:
+            logger.info(f"📼 HTTP oynatma bitti: {total:.2f} sn, {self.served} istek oynatıldı, {self.misses} eşleşmeyen")
+        marks = self.cycle_marks + [(None, time.perf_counter())]
+        for (number, start), (_, end) in zip(marks, marks[1:]):
+            logger.info(f"   Döngü {number}: {end - start:.3f} sn")
+
+
+def install_from_env(bot_name: str) -> Optional[Cassette]:
+    """BOT_HTTP_MODE ayarlıysa cassette'i kurar"""
+    global ACTIVE
+    mode = os.getenv('BOT_HTTP_MODE', '').strip().lower()
+    if not mode:
+        return None
+    path = os.getenv('BOT_HTTP_CASSETTE', f'../logs/{bot_name}_cassette.jsonl')
+    ACTIVE = Cassette(mode, path, bot_name)
+    ACTIVE.install()
+    return ACTIVE
+
+
+def uninstall():
+    global ACTIVE
+    if ACTIVE is not None:
+        ACTIVE.uninstall()
+        ACTIVE = None
+
+
+def is_active() -> bool:
+    return ACTIVE is not None
+
+
+def scratch_path(filename: str) -> Optional[str]:
+    """Cassette etkinse dosyanın geçici klasördeki yolu, değilse None (varsayılan yol kullanılır)"""
+    if ACTIVE is None:
+        return None
+    return os.path.join(ACTIVE.scratch_dir, filename)
+
+
+def mark_cycle(number: int):
+    if ACTIVE is not None:
+        ACTIVE.mark_cycle(number)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bellek Profili Modu
+Bot haftalarca çalışırken RSS'in neden büyüdüğünü görmek için isteğe bağlı teşhis modu.
+BOT_MEMORY_PROFILE=1 ile açılır. Her döngü sonunda tracemalloc anlık görüntüsü alınır ve
+bot sürecinin ve alt süreçlerinin (Playwright'ın açtığı Chromium) RSS'i /proc'tan okunur.
+Görüntüler hem bir önceki döngüyle hem ilk görüntüyle karşılaştırılır; en çok büyüyen
+kaynak satırları ve art arda büyümeye devam eden satırlar ../logs/<bot>_memory.jsonl
+dosyasına (döngü başına bir satır) yazılır.
+
+BOT_MEMORY_PROFILE bir sayı ise tracemalloc'un tutacağı çağrı yığını derinliği olarak
+kullanılır (varsayılan 1: sadece ayıran satır). BOT_MEMORY_TOP raporlanacak satır sayısı.
+"""
+
+import json
+import logging
+import os
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Kaç döngü art arda büyüyen satır "sürekli büyüyor" sayılır
+STEADY_GROWTH_CYCLES = 3
+
+# tracemalloc'un ve bu modülün kendi ayırmaları, import mekanizması rapora girmesin
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def _status_rss(pid) -> Optional[int]:
+    """/proc/<pid>/status içindeki VmRSS (byte); okunamazsa None"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _parent_pids() -> Dict[int, int]:
+    """pid -> ebeveyn pid (Linux /proc)"""
+    parents = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return parents
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+            # Süreç adı parantez içinde ve boşluk içerebilir; ebeveyn pid son ')' sonrasındaki 2. alan
+            parents[int(entry)] = int(stat[stat.rindex(')') + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+    return parents
+
+
+def process_rss() -> Tuple[Optional[int], int, int]:
+    """(bot sürecinin RSS'i, tüm alt süreçlerin toplam RSS'i, alt süreç sayısı)"""
+    own_pid = os.getpid()
+    children: Dict[int, List[int]] = {}
+    for pid, parent in _parent_pids().items():
+        children.setdefault(parent, []).append(pid)
+
+    total = 0
+    count = 0
+    stack = list(children.get(own_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        rss = _status_rss(pid)
+        if rss is not None:
+            total += rss
+            count += 1
+    return _status_rss('self'), total, count
+
+
+def _site(stat: tracemalloc.StatisticDiff) -> str:
+    return ' <- '.join(f"{frame.filename}:{frame.lineno}" for frame in stat.traceback)
+
+
+def _top(diffs: List[tracemalloc.StatisticDiff], limit: int) -> List[dict]:
+    return [
+        {'site': _site(stat), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff, 'size': stat.size}
+        for stat in diffs[:limit] if stat.size_diff > 0
+    ]
+
+
+class MemoryProfiler:
+    """Döngü sonlarında bellek görüntüsü alır ve büyüyen ayırma noktalarını raporlar"""
+
+    def __init__(self, name: str, path: Optional[str] = None, top: int = 10, frames: int = 1, metrics=None):
+        self.name = name
+        self.path = path or f'../logs/{name}_memory.jsonl'
+        self.top = top
+        self.frames = frames
+        self.metrics = metrics
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        # Ayırma noktası -> art arda büyüdüğü döngü sayısı
+        self._growth_streaks: Dict[str, int] = {}
+        self._started_rss: Optional[int] = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._baseline = self._previous = self._take()
+        self._started_rss = process_rss()[0]
+        logger.info(f"🧠 Bellek profili açık (tracemalloc, {self.frames} çerçeve) -> {self.path}")
+
+    def _take(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def checkpoint(self, cycle: int) -> dict:
+        """Döngü sonu görüntüsü; kaydı dosyaya yazar ve döndürür"""
+        started = time.perf_counter()
+        snapshot = self._take()
+        key_type = 'traceback' if self.frames > 1 else 'lineno'
+        since_last = snapshot.compare_to(self._previous, key_type)
+        since_start = snapshot.compare_to(self._baseline, key_type)
+        self._previous = snapshot
+
+        # Her döngüde büyümeye devam eden satırlar (tek seferlik önbellek dolumundan ayırmak için)
+        grown = {_site(stat) for stat in since_last if stat.size_diff > 0}
+        self._growth_streaks = {site: self._growth_streaks.get(site, 0) + 1 for site in grown}
+        growth_by_site = {_site(stat): stat.size_diff for stat in since_start}
+        steady = sorted(
+            ((site, streak) for site, streak in self._growth_streaks.items()
+             if streak >= STEADY_GROWTH_CYCLES and growth_by_site.get(site, 0) > 0),
+            key=lambda item: growth_by_site.get(item[0], 0), reverse=True,
+        )[:self.top]
+
+        traced_current, traced_peak = tracemalloc.get_traced_memory()
+        rss, children_rss, children = process_rss()
+        record = {
+            'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'cycle': cycle,
+            'rss_bytes': rss,
+            'rss_growth_bytes': rss - self._started_rss if rss is not None and self._started_rss is not None else None,
+            'children_rss_bytes': children_rss,
+            'children': children,
+            'traced_bytes': traced_current,
+            'traced_peak_bytes': traced_peak,
+            'top_growth_last_cycle': _top(since_last, self.top),
+            'top_growth_since_start': _top(since_start, self.top),
+            'steady_growth': [
+                {'site': site, 'cycles': streak, 'size_diff_since_start': growth_by_site.get(site, 0)}
+                for site, streak in steady
+            ],
+        }
+        record['took_seconds'] = round(time.perf_counter() - started, 3)
+        self._write(record)
+        self._publish(record)
+        self._log(record)
+        return record
+
+    def _write(self, record: dict):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.warning(f"Bellek profili yazılamadı: {e}")
+
+    def _publish(self, record: dict):
+        if not self.metrics:
+            return
+        if record['rss_bytes'] is not None:
+            self.metrics.gauge('memory.rss_bytes', record['rss_bytes'])
+        self.metrics.gauge('memory.children_rss_bytes', record['children_rss_bytes'])
+        self.metrics.gauge('memory.children', record['children'])
+        self.metrics.gauge('memory.traced_bytes', record['traced_bytes'])
+        self.metrics.observe('memory.checkpoint_seconds', record['took_seconds'])
+
+    def _log(self, record: dict):
+        mb = 1024 * 1024
+        rss = f"{record['rss_bytes'] / mb:.1f} MB" if record['rss_bytes'] is not None else "?"
+        logger.info(
+            f"🧠 Bellek: RSS {rss}, alt süreçler {record['children_rss_bytes'] / mb:.1f} MB ({record['children']} süreç), "
+            f"Python {record['traced_bytes'] / mb:.1f} MB ({record['took_seconds']:.2f} sn)"
+        )
+        for item in record['top_growth_since_start'][:3]:
+            logger.info(f"   📈 +{item['size_diff'] / 1024:.0f} KB {item['site']}")
+        for item in record['steady_growth'][:3]:
+            logger.warning(f"   ⚠️ {item['cycles']} döngüdür büyüyor (+{item['size_diff_since_start'] / 1024:.0f} KB): {item['site']}")
+
+
+def from_env(bot_name: str, metrics=None) -> Optional[MemoryProfiler]:
+    """BOT_MEMORY_PROFILE ayarlıysa profili oluşturur (start() bot döngüsü başlarken çağrılır)"""
+    value = os.getenv('BOT_MEMORY_PROFILE', '').strip().lower()
+    if not value or value in ('0', 'false', 'no'):
+        return None
+    frames = int(value) if value.isdigit() and int(value) > 1 else 1
+    top = int(os.getenv('BOT_MEMORY_TOP', '10'))
+    return MemoryProfiler(bot_name, top=top, frames=frames, metrics=metrics)
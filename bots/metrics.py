@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bot Metrikleri
+Sayaçlar, anlık değerler ve süre ölçümleri için basit, thread-safe metrik deposu.
+Her döngü sonunda ../logs/<bot>_metrics.json dosyasına yazılır.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class Metrics:
+    """Sayaç (incr), anlık değer (gauge) ve dağılım (observe) tutar"""
+
+    def __init__(self, name: str, path: Optional[str] = None):
+        self.name = name
+        self.path = path or f'../logs/{name}_metrics.json'
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, object] = {}
+        self._observations: Dict[str, dict] = {}
+
+    def incr(self, key: str, value: float = 1):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(self, key: str, value: object):
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, key: str, value: float):
+        """Bir ölçümü (süre, byte, token...) dağılıma ekler"""
+        with self._lock:
+            stats = self._observations.get(key)
+            if stats is None:
+                stats = self._observations[key] = {'count': 0, 'sum': 0.0, 'min': value, 'max': value, 'last': value}
+            stats['count'] += 1
+            stats['sum'] += value
+            stats['min'] = min(stats['min'], value)
+            stats['max'] = max(stats['max'], value)
+            stats['last'] = value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            observations = {}
+            for key, stats in self._observations.items():
+                observations[key] = dict(stats, avg=stats['sum'] / stats['count'])
+            return {
+                'bot': self.name,
+                'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'observations': observations,
+            }
+
+    def dump(self):
+        """Metrikleri JSON dosyasına yazar (yarım dosya kalmaması için önce geçici dosyaya)"""
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Metrik dosyası yazılamadı: {e}")
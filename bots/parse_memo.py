@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parse Sonucu Hafızası
+Trend sayfasının içeriği önceki indirmeyle birebir aynıysa BeautifulSoup parse'ı,
+seçici taraması ve regex temizliği tekrar yapılmaz; içerik özetiyle (blake2b) saklanan
+önceki trend listesi döndürülür. Anahtar sunucunun ETag'ine değil içeriğin kendisine
+bağlı olduğu için koşullu isteği desteklemeyen sitelerde de çalışır. En son kullanılan
+belirli sayıda sonuç tutulur (LRU).
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Tuple
+
+# Varsayılan en fazla kayıt (bölge x kaynak sayısının birkaç katı yeterli)
+DEFAULT_MAX_ENTRIES = 64
+
+
+def content_digest(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class ParseMemo:
+    """(kaynak, url, içerik özeti) -> çıkarılan trendler; boyutu sınırlı LRU"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, metrics=None):
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        # anahtar -> (trendler, parse süresi)
+        self._entries: "OrderedDict[Tuple[str, str, bytes], Tuple[List[str], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get_or_parse(self, source: str, url: str, content: bytes,
+                     parse: Callable[[], Tuple[List[str], bool]]) -> List[str]:
+        """İçerik daha önce parse edildiyse sonucu döndürür, edilmediyse parse edip saklar
+
+        parse (trendler, saklanabilir mi) döndürür; sonuç içerikten değil başka bir kaynaktan
+        geldiyse (ör. Playwright sayfayı yeniden yükledi) saklanmaz.
+        """
+        key = (source, url, content_digest(content))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += cached[1]
+        if cached is not None:
+            self._publish(hit=True, seconds=cached[1])
+            return list(cached[0])
+
+        started = time.perf_counter()
+        trends, cacheable = parse()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.misses += 1
+            # Boş sonuç saklanmaz (geçici bir hata olabilir, sonraki döngüde tekrar denensin)
+            if trends and cacheable:
+                self._entries[key] = (list(trends), elapsed)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        self._publish(hit=False, seconds=elapsed)
+        return trends
+
+    def _publish(self, hit: bool, seconds: float):
+        if not self.metrics:
+            return
+        if hit:
+            self.metrics.incr('parse_memo.hits')
+            self.metrics.incr('parse_memo.saved_seconds', seconds)
+        else:
+            self.metrics.incr('parse_memo.misses')
+            self.metrics.observe('parse_memo.parse_seconds', seconds)
+        stats = self.stats()
+        self.metrics.gauge('parse_memo.hit_rate', stats['hit_rate'])
+        self.metrics.gauge('parse_memo.entries', stats['entries'])
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'saved_seconds': round(self.saved_seconds, 3),
+                'entries': len(self._entries),
+            }
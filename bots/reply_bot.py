@@ -29,6 +29,16 @@ import json
 from urllib.parse import unquote
 from dotenv import load_dotenv
 
+import http_cassette
+import memory_profiler
+from bot_config import ConfigWatcher
+from circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from clock import SystemClock
+from groq_client import GroqClient
+from metrics import Metrics
+from similarity_index import SimilarityIndex
+from state_snapshot import RateLimits, StateSnapshot, stop_on_sigterm
+
 # .env dosyasını yükle
 load_dotenv()
 
@@ -53,7 +63,10 @@ logger = logging.getLogger(__name__)
 
 
 class TwitterReplyBot:
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Zaman ve beklemeler bu saatten alınır (simülasyonda sanal saat verilir)
+        self.clock = clock or SystemClock()
+        
         # Twitter API v2 credentials (.env dosyasından oku)
         # Bearer token'ı URL decode et (%2F -> /, %3D -> =)
         bearer_token_raw = os.getenv('TWITTER_BEARER_TOKEN', '')
@@ -67,21 +80,75 @@ class TwitterReplyBot:
         self.access_token = os.getenv('TWITTER_ACCESS_TOKEN', '')
         self.access_token_secret = os.getenv('TWITTER_ACCESS_TOKEN_SECRET', '')
         
-        # Atatürk'e hakaret içeren kelimeler (arama için)
-        self.ataturk_negative_keywords = [
-            "atatürk düşmanı",
-            "atatürk karşıtı",
-            "atatürk nefret",
-            "atatürk hakaret",
-            "mustafa kemal düşman",
-            "kemalist düşman"
-        ]
+        # Anahtar kelimeler, prompt'lar ve bekleme süreleri (../config/bot_config.json)
+        self.config = ConfigWatcher('reply_bot')
         
         # Groq API key (AI cevaplar için)
         self.groq_api_key = os.getenv('GROQ_API_KEY', '')
         
         # Çekilen tweet'leri sakla (queue)
         self.tweet_queue = []
+        
+        # Metrikler (../logs/reply_bot_metrics.json)
+        self.metrics = Metrics('reply_bot')
+        
+        # Groq için devre kesici (çökmüşse timeout beklenmesin)
+        self.breakers = CircuitBreakerRegistry(
+            lambda: self.config.current.circuit_breaker, metrics=self.metrics, clock=self.clock.monotonic
+        )
+        
+        # Groq istemcisi (tam veya akış modunda, devre kesici üzerinden)
+        self.groq = GroqClient(self.groq_api_key, self.breakers, metrics=self.metrics)
+        
+        # Atılmış cevapların benzerlik indeksi (aynı cevabı/fallback'i tekrar atmamak için)
+        self.similarity = SimilarityIndex(
+            'reply_bot',
+            threshold=lambda: self.config.current.similarity['threshold'],
+            # HTTP kayıt/oynatmada gerçek indeks yerine boş geçici indeks (oynatma kaydı tekrarlasın)
+            path=http_cassette.scratch_path('reply_bot_similarity.jsonl'),
+            metrics=self.metrics,
+        )
+        
+        # Uç nokta başına son görülen rate limit (hak yoksa reset'e kadar istek atılmaz)
+        self.rate_limits = RateLimits(clock=self.clock)
+        
+        # Yeniden başlatmada rate limit ve queue kaybolmasın (../data/reply_bot_state.json)
+        self.state = StateSnapshot(
+            'reply_bot',
+            max_age_seconds=lambda: self.config.current.state_snapshot['max_age_minutes'] * 60,
+            # HTTP kayıt/oynatmada gerçek durum dosyası okunmaz/yazılmaz (oynatma kayıttaki ilk toplamayı atlamasın)
+            path=http_cassette.scratch_path('reply_bot_state.json'),
+            clock=self.clock,
+            metrics=self.metrics,
+        )
+        
+        # Kaç döngü çalıştığı (HTTP kayıt dosyasında döngü işaretleri için)
+        self.cycle_count = 0
+        
+        # BOT_MEMORY_PROFILE=1 ise döngü sonlarında bellek görüntüsü (../logs/reply_bot_memory.jsonl)
+        self.memory = memory_profiler.from_env('reply_bot', metrics=self.metrics)
+
+    def restore_state(self):
+        """Önceki çalışmadan kalan rate limit durumunu ve queue'yu yükler"""
+        if not self.config.current.state_snapshot['enabled']:
+            return
+        state = self.state.load()
+        self.rate_limits.load_dict(state.get('rate_limits') or {})
+        queue = [tweet for tweet in state.get('tweet_queue') or [] if tweet.get('id') and tweet.get('text')]
+        if queue:
+            self.tweet_queue = queue + self.tweet_queue
+            logger.info(f"📋 Önceki çalışmadan {len(queue)} tweet queue'ya geri yüklendi")
+        for endpoint in ('search_recent', 'tweets_post'):
+            reset = self.rate_limits.blocked_until(endpoint)
+            if reset:
+                logger.info(f"⏳ {endpoint} hakkı yok, reset: {time.ctime(reset)} (o zamana kadar istek atılmayacak)")
+
+    def save_state(self):
+        if self.config.current.state_snapshot['enabled']:
+            self.state.save({
+                'rate_limits': self.rate_limits.to_dict(),
+                'tweet_queue': self.tweet_queue,
+            })
 
     def search_tweets(self, query: str, max_results: int = 10) -> Optional[List[dict]]:
         """Twitter'da tweet ara"""
@@ -130,6 +197,11 @@ class TwitterReplyBot:
             
             # Twitter API v2 ile gerçek tweet at
             if OAUTH_AVAILABLE and self.api_key and self.api_secret and self.access_token and self.access_token_secret:
+                # Son cevaptan hak kalmadığı biliniyorsa reset'e kadar istek atma (boşuna 429 alınmasın)
+                reset = self.rate_limits.blocked_until('tweets_post')
+                if reset:
+                    logger.warning(f"⏳ Tweet ATMA hakkı yok, reset: {time.ctime(reset)} - istek atılmadı")
+                    return False
                 try:
                     # OAuth 1.0a authentication
                     auth = OAuth1(self.api_key, self.api_secret, self.access_token, self.access_token_secret)
@@ -146,6 +218,7 @@ class TwitterReplyBot:
                     }
                     
                     response = requests.post(url, json=tweet_data, auth=auth, timeout=10)
+                    self.rate_limits.update('tweets_post', response.headers, response.status_code)
                     
                     # TWEET ATMA rate limit header'larını logla
                     if 'x-rate-limit-limit' in response.headers:
@@ -165,7 +238,7 @@ class TwitterReplyBot:
                     if response.status_code == 429:
                         if 'x-rate-limit-reset' in response.headers:
                             reset_time = int(response.headers['x-rate-limit-reset'])
-                            current_time = int(time.time())
+                            current_time = int(self.clock.time())
                             wait_seconds = reset_time - current_time
                             
                             logger.error(f"❌ Tweet ATMA rate limit doldu! Reset zamanı: {time.ctime(reset_time)} ({wait_seconds//60} dakika sonra)")
@@ -204,125 +277,29 @@ class TwitterReplyBot:
 
     def check_ataturk_negative(self, tweet_text: str) -> bool:
         """Tweet'te Atatürk'e hakaret var mı kontrol et"""
-        tweet_lower = tweet_text.lower()
-        
-        negative_phrases = [
-            "atatürk düşman",
-            "atatürk karşıt",
-            "atatürk nefret",
-            "atatürk hakaret",
-            "mustafa kemal düşman",
-            "kemalist düşman",
-            "atatürk sevmiyorum",
-            "atatürk nefret ediyorum"
-        ]
-        
-        for phrase in negative_phrases:
-            if phrase in tweet_lower:
-                return True
-        
-        return False
+        return self.config.current.ataturk_negative_matcher.matches(tweet_text)
 
     def should_reply_to_tweet(self, tweet_text: str) -> bool:
         """Tweet'e cevap verilmeli mi kontrol et (hassas konuları filtrele)"""
-        tweet_lower = tweet_text.lower()
-        
-        # Cevap VERİLMEMELİ konular
-        sensitive_keywords = [
-            "şehit",
-            "cenaze",
-            "ölüm",
-            "ölmüş",
-            "öldü",
-            "öldürüldü",
-            "katledildi",
-            "vuruldu",
-            "kaza",
-            "trafik kazası",
-            "deprem",
-            "sel",
-            "yangın",
-            "terör",
-            "bomba",
-            "saldırı",
-            "hastane",
-            "ameliyat",
-            "kanser",
-            "hasta",
-            "rahatsız",
-            "başsağlığı",
-            "taziye",
-            "yas",
-            "acı",
-            "üzüntü",
-            "felaket",
-            "afet",
-            "yardım kampanyası",
-            "bağış",
-            "yardım",
-            # Milli günler ve bayramlar (milli takım hariç)
-            "milli gün",
-            "cumhuriyet bayramı",
-            "zafer bayramı",
-            "23 nisan",
-            "19 mayıs",
-            "30 ağustos",
-            "29 ekim"
-        ]
+        settings = self.config.current
         
         # Hassas konu varsa cevap verme
-        for keyword in sensitive_keywords:
-            if keyword in tweet_lower:
-                logger.info(f"⚠️ Hassas konu tespit edildi ('{keyword}'), cevap verilmeyecek")
-                return False
-        
-        # Troll tweet mi kontrol et (basit heuristics)
-        troll_indicators = [
-            "troll",
-            "şaka",
-            "mizah",
-            "komik",
-            "gül",
-            "lol",
-            "haha",
-            "😂",
-            "🤣",
-            "😄"
-        ]
+        keyword = settings.sensitive_matcher.find(tweet_text)
+        if keyword:
+            logger.info(f"⚠️ Hassas konu tespit edildi ('{keyword}'), cevap verilmeyecek")
+            return False
         
         # Troll tweet ise cevap ver
-        for indicator in troll_indicators:
-            if indicator in tweet_lower:
-                logger.info(f"✅ Troll tweet tespit edildi, cevap verilecek")
-                return True
+        if settings.troll_matcher.matches(tweet_text):
+            logger.info(f"✅ Troll tweet tespit edildi, cevap verilecek")
+            return True
         
         # Normal tweet ise cevap ver (varsayılan)
         return True
 
     def check_milli_takim(self, tweet_text: str) -> bool:
         """Tweet milli takım ile ilgili mi kontrol et"""
-        tweet_lower = tweet_text.lower()
-        milli_keywords = [
-            "milli takım",
-            "a milli",
-            "milli futbol",
-            "fifa",
-            "dünya kupası",
-            "play-off",
-            "elemeler",
-            "bizimçocuklar",
-            "montella",
-            "hakan çalhanoğlu",
-            "galibiyet",
-            "zafer",
-            "tebrik",
-            "tebrikler"
-        ]
-        
-        for keyword in milli_keywords:
-            if keyword in tweet_lower:
-                return True
-        return False
+        return self.config.current.milli_takim_matcher.matches(tweet_text)
 
     def generate_reply_with_ai(self, tweet_text: str, is_ataturk_negative: bool = False) -> Optional[str]:
         """AI ile dark mizahlı, kudurtucu cevap oluştur (HER TWEET İÇİN AYRI CEVAP)"""
@@ -331,104 +308,93 @@ class TwitterReplyBot:
             return None
         
         try:
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.groq_api_key}",
-                "Content-Type": "application/json"
-            }
+            # Tek bir yapılandırma nesnesi kullan (istek sırasında değişse bile tutarlı kalsın)
+            settings = self.config.current
             
             # Milli takım tweet'i mi kontrol et
-            is_milli_takim = self.check_milli_takim(tweet_text)
+            is_milli_takim = settings.milli_takim_matcher.matches(tweet_text)
             
             if is_ataturk_negative:
                 # Atatürk'e hakaret edenlere özel absürt, dark mizahlı cevap
-                prompt = f"""Birisi şu tweet'i attı: "{tweet_text}"
-
-Bu kişi Atatürk'e hakaret ediyor. Ona dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap yaz. 
-- Dark mizah içermeli (sert, kudurtucu ama hakaret değil)
-- Onu kudurtmalı, sinirlendirmeli ama küfür/hakaret içermemeli
-- Alaycı, küçümseyici ton kullan ama yasal sınırlar içinde kal
-- Dava edilme riski olmamalı (açık hakaret yok)
-- Maksimum 280 karakter
-- Sadece cevabı yaz, başka açıklama ekleme"""
+                prompt = settings.ataturk_prompt.render(tweet_text=tweet_text)
             elif is_milli_takim:
                 # Milli takım tweet'lerine özel troll ama dark mizah olmayan cevap
-                prompt = f"""Birisi şu tweet'i attı: "{tweet_text}"
-
-Bu tweet milli takım ile ilgili. Ona troll, eğlenceli, absürt ama dark mizah olmayan bir cevap yaz.
-- Troll ve eğlenceli olmalı
-- Absürt ve komik olabilir
-- Dark mizah, kudurtucu veya saygısız olmamalı
-- Milli takıma hakaret etme, sadece eğlenceli troll yap
-- Maksimum 280 karakter
-- Sadece cevabı yaz, başka açıklama ekleme"""
+                prompt = settings.milli_takim_prompt.render(tweet_text=tweet_text)
             else:
                 # Genel dark mizahlı, kudurtucu cevap
-                prompt = f"""Birisi şu tweet'i attı: "{tweet_text}"
-
-Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap yaz. 
-- Dark mizah içermeli (sert, kudurtucu ama hakaret değil)
-- Alaycı, küçümseyici, kudurtucu ton kullan
-- Onu sinirlendirmeli ama küfür/hakaret içermemeli
-- Yasal sınırlar içinde kal (açık hakaret yok)
-- Maksimum 280 karakter
-- Sadece cevabı yaz, başka açıklama ekleme"""
+                prompt = settings.general_prompt.render(tweet_text=tweet_text)
             
             # System message'ı tweet tipine göre ayarla
             if is_milli_takim:
-                system_message = "Sen troll, eğlenceli, absürt tweet cevapları yazan bir asistansın. Milli takım tweet'lerine troll ve eğlenceli cevaplar verirsin. Absürt ve komik olabilirsin ama dark mizah, kudurtucu veya saygısız olmazsın. Milli takıma hakaret etmezsin."
+                system_message = settings.system_milli_takim
             else:
-                system_message = "Sen dark mizahlı, kudurtucu, agresif tweet cevapları yazan bir asistansın. Alaycı, küçümseyici ama yasal sınırlar içinde kalarak kudurtucu cevaplar üretirsin. Küfür ve açık hakaret kullanmazsın ama kudurtucu olursun."
+                system_message = settings.system_general
             
-            payload = {
-                "model": "llama-3.3-70b-versatile",  # En güçlü model
-                "messages": [
+            completion = self.groq.generate(
+                [
                     {"role": "system", "content": system_message},
                     {"role": "user", "content": prompt}
                 ],
-                "temperature": 0.95 if not is_milli_takim else 0.8,  # Milli takım için biraz daha düşük temperature
-                "max_tokens": 200
-            }
+                settings.milli_takim_temperature if is_milli_takim else settings.temperature,
+                models=settings.models['tiers'],
+                latency_budget=settings.models['latency_budget_seconds'],
+                timeout=settings.models['timeout_seconds'],
+                stream=settings.stream_generation,
+            )
             
-            response = requests.post(url, headers=headers, json=payload, timeout=15)
-            
-            if response.status_code == 200:
-                result = response.json()
-                reply = result['choices'][0]['message']['content'].strip()
-                # 280 karakter limiti
-                if len(reply) > 280:
-                    reply = reply[:277] + "..."
-                return reply
-            else:
-                logger.error(f"Groq API hatası: {response.status_code} - {response.text}")
-                return None
+            # 280 karakter limiti (cümle sınırından kesilmiş olarak gelir)
+            return completion.text or None
                 
+        except CircuitOpenError as e:
+            logger.warning(f"⏭️ Groq atlandı: {e}")
+            return None
         except Exception as e:
             logger.error(f"AI cevap üretme hatası: {e}")
             return None
 
-    def generate_reply(self, tweet_text: str, is_ataturk_negative: bool = False) -> str:
-        """Tweet için dark mizahlı, kudurtucu cevap oluştur (AI ile - HER TWEET İÇİN AYRI)"""
+    def is_repeat(self, text: str) -> bool:
+        """Metin daha önce atılmış bir cevaba çok benziyor mu?"""
+        if not self.config.current.similarity['enabled']:
+            return False
+        match = self.similarity.find_similar(text)
+        if match:
+            logger.info(f"♻️ Önceki bir cevaba %{match[0] * 100:.0f} benziyor: {match[1]}")
+            return True
+        return False
+
+    def generate_reply(self, tweet_text: str, is_ataturk_negative: bool = False) -> Optional[str]:
+        """Tweet için dark mizahlı, kudurtucu cevap oluştur (AI ile - HER TWEET İÇİN AYRI)
+        
+        Önceki cevaplara çok benzeyen cevap atılmaz; None dönerse tweet atlanmalı.
+        """
         # ÖNCE AI'YI DENE
-        reply = self.generate_reply_with_ai(tweet_text, is_ataturk_negative)
+        ai_reply = self.generate_reply_with_ai(tweet_text, is_ataturk_negative)
+        reply = ai_reply
+        if reply and self.is_repeat(reply):
+            reply = None
         
-        # AI başarısız olursa fallback (ama önce AI'yı dene)
-        if not reply:
-            logger.warning("⚠️ AI cevap üretemedi, tekrar deneniyor...")
-            # Bir kez daha dene
-            time.sleep(1)
+        # Model hataları/gecikmeleri GroqClient'ta yedek modelle karşılanıyor; burada sadece
+        # öncekilere benzeyen cevap için bir kez daha üretilir
+        if reply is None and ai_reply:
+            logger.warning("⚠️ Cevap öncekilere benziyor, tekrar deneniyor...")
             reply = self.generate_reply_with_ai(tweet_text, is_ataturk_negative)
-            
-            # Hala başarısızsa fallback
-            if not reply:
-                is_milli_takim = self.check_milli_takim(tweet_text)
-                if is_ataturk_negative:
-                    reply = "Atatürk'e laf atıp duruyorsun, senin mantığın nerede kaldı? Bir düşün bakalım."
-                elif is_milli_takim:
-                    reply = "Vay be, milli takım! 🏆🇹🇷"
-                else:
-                    reply = "Bu ne saçmalık böyle? Bir düşün bakalım ne dediğini."
-                logger.warning("⚠️ AI çalışmadı, fallback cevap kullanıldı")
+            if reply and self.is_repeat(reply):
+                reply = None
+        
+        # Hala başarısızsa fallback
+        if not reply:
+            is_milli_takim = self.check_milli_takim(tweet_text)
+            if is_ataturk_negative:
+                reply = "Atatürk'e laf atıp duruyorsun, senin mantığın nerede kaldı? Bir düşün bakalım."
+            elif is_milli_takim:
+                reply = "Vay be, milli takım! 🏆🇹🇷"
+            else:
+                reply = "Bu ne saçmalık böyle? Bir düşün bakalım ne dediğini."
+            if self.is_repeat(reply):
+                logger.warning("♻️ Fallback cevap daha önce kullanıldı, tweet atlanıyor")
+                self.metrics.incr('dedup.reply_bot.skipped')
+                return None
+            logger.warning("⚠️ AI çalışmadı, fallback cevap kullanıldı")
         
         return reply
 
@@ -438,6 +404,12 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
             logger.warning("Twitter Bearer Token bulunamadı!")
             return None
         
+        # Son cevaptan hak kalmadığı biliniyorsa reset'e kadar istek atma
+        reset = self.rate_limits.blocked_until('search_recent')
+        if reset:
+            logger.warning(f"⏳ Tweet ÇEKME hakkı yok, reset: {time.ctime(reset)} - istek atılmadı")
+            return None
+        
         try:
             url = "https://api.twitter.com/2/tweets/search/recent"
             headers = {
@@ -452,13 +424,14 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
             }
             
             response = requests.get(url, headers=headers, params=params, timeout=10)
+            self.rate_limits.update('search_recent', response.headers, response.status_code)
             
             # Rate limit kontrolü - 429 alırsak None dön (tweet çekme limit'i dolmuş, ama tweet atma limit'i farklı)
             if response.status_code == 429:
                 # Tweet ÇEKME rate limit'i dolmuş (tweet ATMA limit'i farklı!)
                 if 'x-rate-limit-reset' in response.headers:
                     reset_time = int(response.headers['x-rate-limit-reset'])
-                    current_time = int(time.time())
+                    current_time = int(self.clock.time())
                     wait_seconds = reset_time - current_time
                     
                     logger.warning(f"⏳ Tweet ÇEKME rate limit doldu! Reset: {time.ctime(reset_time)} ({wait_seconds//60} dakika sonra)")
@@ -503,6 +476,9 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
         """Bot'u bir kez çalıştır (1 tweet bulup cevap ver)"""
         logger.info("")
         
+        self.cycle_count += 1
+        http_cassette.mark_cycle(self.cycle_count)
+        
         # Önce queue'da tweet var mı kontrol et
         if len(self.tweet_queue) > 0:
             logger.info(f"📋 Queue'da {len(self.tweet_queue)} tweet var, önce onlara cevap atılıyor...")
@@ -515,10 +491,14 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
             
             logger.info(f"🎯 Queue'dan tweet alındı: {tweet_id}")
             reply = self.generate_reply(tweet_text, is_ataturk_negative=is_ataturk_negative)
+            if reply is None:
+                logger.warning(f"⏭️ Tekrar olmayan cevap üretilemedi, tweet atlandı: {tweet_id}")
+                return False
             success = self.reply_to_tweet(tweet_id, reply, original_tweet=tweet_text)
             
             if success:
                 logger.info(f"✅ Queue'dan tweet başarıyla atıldı! Kalan: {len(self.tweet_queue)}")
+                self.similarity.add(reply)
                 return True
             else:
                 # Tweet atılamadı, queue'ya geri ekle (başa)
@@ -590,10 +570,14 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
             
             logger.info(f"🎯 Queue'dan tweet alındı: {tweet_id}")
             reply = self.generate_reply(tweet_text, is_ataturk_negative=is_ataturk_negative)
+            if reply is None:
+                logger.warning(f"⏭️ Tekrar olmayan cevap üretilemedi, tweet atlandı: {tweet_id}")
+                return False
             success = self.reply_to_tweet(tweet_id, reply, original_tweet=tweet_text)
             
             if success:
                 logger.info(f"✅ Queue'dan tweet başarıyla atıldı! Kalan: {len(self.tweet_queue)}")
+                self.similarity.add(reply)
                 return True
             else:
                 # Tweet atılamadı, queue'ya geri ekle (başa)
@@ -609,11 +593,21 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
         """Bot'u sürekli çalıştır (her 15 dakikada bir)"""
         logger.info("=" * 60)
         logger.info("Twitter Reply Bot Başlatıldı")
-        logger.info("Her 15 dakikada bir tweet bulup cevap verecek")
+        logger.info(f"Her {self.config.current.idle_minutes} dakikada bir tweet bulup cevap verecek")
         logger.info("=" * 60)
         
+        # Yapılandırma dosyası değişirse yeniden başlatmadan devreye al
+        self.config.start()
+        
+        # Önceki çalışmanın rate limit durumu ve queue'su (soğuk başlayıp 429 yememek için)
+        self.restore_state()
+        if self.memory:
+            self.memory.start()
+        
         while True:
             try:
+                settings = self.config.current
+                
                 # Bir kez çalıştır
                 success = self.run_once()
                 
@@ -622,9 +616,17 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
                 else:
                     logger.info("⚠️ Tweet atılamadı veya atlandı")
                 
+                # Açık devreleri logla, metrikleri dosyaya yaz
+                self.breakers.log_states(logger)
+                self.groq.log_comparison(logger)
+                if self.memory:
+                    self.memory.checkpoint(self.cycle_count)
+                self.metrics.dump()
+                self.save_state()
+                
                 # Queue'da tweet varsa daha sık dene (rate limit reset olunca hemen dene)
                 if len(self.tweet_queue) > 0:
-                    wait_seconds = 60  # Queue'da tweet varsa 1 dakika bekle, sonra tekrar dene
+                    wait_seconds = settings.queue_retry_seconds  # Queue'da tweet varsa kısa bekle, sonra tekrar dene
                     logger.info("")
                     logger.info(f"📋 Queue'da {len(self.tweet_queue)} tweet var, {wait_seconds} saniye sonra tekrar denenecek...")
                     logger.info("=" * 60)
@@ -633,35 +635,44 @@ Buna dark mizahlı, kudurtucu, agresif ama dava edilme riski olmayan bir cevap y
                     elapsed = 0
                     while elapsed < wait_seconds:
                         sleep_time = min(15, wait_seconds - elapsed)  # Her 15 saniye veya kalan süre
-                        time.sleep(sleep_time)
+                        self.clock.sleep(sleep_time)
                         elapsed += sleep_time
                         remaining = wait_seconds - elapsed
                         if remaining > 0:
                             logger.info(f"⏳ Queue'da tweet bekliyor... {remaining} saniye sonra tekrar denenecek (Queue: {len(self.tweet_queue)} tweet)")
                 else:
-                    # Queue boşsa 15 dakika bekle
-                    wait_minutes = 15
+                    # Queue boşsa uzun bekle
+                    wait_minutes = settings.idle_minutes
                     logger.info("")
                     logger.info(f"⏳ Queue boş, {wait_minutes} dakika bekleniyor... (Yeni tweet çekmek için)")
                     logger.info("=" * 60)
-                    time.sleep(wait_minutes * 60)
+                    self.clock.sleep(wait_minutes * 60)
                 
             except KeyboardInterrupt:
                 logger.info("")
                 logger.info("Bot durduruldu (Ctrl+C)")
+                self.save_state()
                 break
             except Exception as e:
                 logger.error(f"❌ Hata: {e}")
-                logger.info("60 saniye sonra tekrar denenecek...")
-                time.sleep(60)  # Hata olursa 1 dakika bekle
+                retry_seconds = self.config.current.error_retry_seconds
+                logger.info(f"{retry_seconds} saniye sonra tekrar denenecek...")
+                self.clock.sleep(retry_seconds)  # Hata olursa kısa bekle
 
 
 def main():
     """Ana fonksiyon"""
-    bot = TwitterReplyBot()
-    bot.run()
+    # BOT_HTTP_MODE=record/replay ise HTTP istekleri kaydedilir / kayıttan oynatılır
+    http_cassette.install_from_env('reply_bot')
+    stop_on_sigterm()
+    try:
+        bot = TwitterReplyBot()
+        bot.run()
+    except http_cassette.CassetteExhausted:
+        logger.info("📼 Kayıttaki tüm istekler oynatıldı, bot durduruluyor")
+    finally:
+        http_cassette.uninstall()
 
 
 if __name__ == "__main__":
     main()
-
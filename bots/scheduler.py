@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sabit Aralıklı Zamanlayıcı
+Tekrarlayan işler "iş bitince N dakika bekle" yerine saat üzerindeki sabit slotlara göre
+çalışır: slot k = başlangıç + k x periyot. İşin süresi bir sonraki slotu kaydırmaz, böylece
+gerçek aralık periyotta kalır. Her çalışmaya 0-jitter saniye rastgele gecikme eklenir (hep aynı
+saniyede istek atılmasın). İş bir slotu aşacak kadar uzun sürerse kaçırılan slot telafi için
+art arda çalıştırılmaz, atlanır ve sayılır. Tek seferlik işler (ör. ikinci tweet) aynı sıraya
+belirli bir gecikmeyle eklenir.
+"""
+
+import logging
+import math
+import random
+from collections import deque
+from typing import Callable, List, Optional
+
+from clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+# Slot zamanından bu oran kadar (periyodun) geç kalındıysa slot hâlâ çalıştırılır, daha geçse atlanır
+LATE_GRACE_FRACTION = 0.1
+# Aralık/gecikme istatistiği için tutulan son ölçüm sayısı
+STATS_WINDOW = 100
+
+
+class _Task:
+    def __init__(self, name: str, func: Callable[[], None], fire_at: float,
+                 period: Optional[Callable[[], float]] = None, jitter: Optional[Callable[[], float]] = None,
+                 retry_after: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.func = func
+        self.fire_at = fire_at
+        self.period = period
+        self.jitter = jitter
+        self.retry_after = retry_after
+        # Tekrarlayan iş için slot bilgisi
+        self.anchor = fire_at
+        self.current_period = period() if period else None
+        self.slot_index = 0
+        self.slot_time = fire_at
+        self.retrying = False
+
+
+class CadenceStats:
+    """Tekrarlayan bir işin gerçekleşen aralıkları, slot gecikmeleri ve kaçırılan slotları"""
+
+    def __init__(self):
+        self.runs = 0
+        self.missed_slots = 0
+        self.last_start: Optional[float] = None
+        self.intervals = deque(maxlen=STATS_WINDOW)
+        self.lateness = deque(maxlen=STATS_WINDOW)
+
+    def record_start(self, now: float, slot_time: float):
+        self.runs += 1
+        if self.last_start is not None:
+            self.intervals.append(now - self.last_start)
+        self.last_start = now
+        self.lateness.append(max(0.0, now - slot_time))
+
+    def summary(self) -> dict:
+        intervals = list(self.intervals)
+        lateness = list(self.lateness)
+        return {
+            'runs': self.runs,
+            'missed_slots': self.missed_slots,
+            'avg_interval_seconds': round(sum(intervals) / len(intervals), 1) if intervals else None,
+            'max_interval_seconds': round(max(intervals), 1) if intervals else None,
+            'avg_lateness_seconds': round(sum(lateness) / len(lateness), 1) if lateness else None,
+            'max_lateness_seconds': round(max(lateness), 1) if lateness else None,
+        }
+
+
+class Scheduler:
+    """Saat slotlarına bağlı tekrarlayan işler ve tek seferlik işler (tek thread, sırayla)"""
+
+    def __init__(self, clock=None, metrics=None, rng=None):
+        self.clock = clock or SystemClock()
+        self.metrics = metrics
+        self.rng = rng or random
+        self._tasks: List[_Task] = []
+        self.stats = {}
+
+    def every(self, name: str, period: Callable[[], float], func: Callable[[], None],
+              jitter: Optional[Callable[[], float]] = None, retry_after: Optional[Callable[[], float]] = None):
+        """func'ı period() saniyelik slotlarda çalıştırır (ilk slot hemen); hata olursa retry_after() sonra tekrar"""
+        task = _Task(name, func, self.clock.time(), period=period, jitter=jitter, retry_after=retry_after)
+        self.stats[name] = CadenceStats()
+        self._tasks.append(task)
+
+    def once(self, name: str, delay: float, func: Callable[[], None]):
+        """func'ı delay saniye sonra bir kez çalıştırır"""
+        self._tasks.append(_Task(name, func, self.clock.time() + max(0.0, delay)))
+
+    def run(self):
+        """İşleri sırası gelince çalıştırır; sadece KeyboardInterrupt (veya simülasyon sonu) ile çıkar"""
+        while self._tasks:
+            self.run_next()
+
+    def run_next(self):
+        task = min(self._tasks, key=lambda t: t.fire_at)
+        wait = task.fire_at - self.clock.time()
+        if wait > 0:
+            self.clock.sleep(wait)
+
+        if task.period is None:
+            self._tasks.remove(task)
+            self._execute(task)
+            return
+
+        if not task.retrying:
+            self.stats[task.name].record_start(self.clock.time(), task.slot_time)
+        failed = not self._execute(task)
+        self._reschedule(task, failed)
+        self._publish(task.name)
+
+    def _execute(self, task: _Task) -> bool:
+        try:
+            task.func()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Hata ({task.name}): {e}")
+            return False
+
+    def _reschedule(self, task: _Task, failed: bool):
+        now = self.clock.time()
+        period = task.period()
+        if period != task.current_period:
+            # Periyot değişti (yapılandırma yeniden yüklendi): son slottan itibaren yeni periyotla say
+            task.anchor = task.slot_time
+            task.slot_index = 0
+            task.current_period = period
+
+        # Sıradaki slot: iş bir sonraki slotu geçtiyse (tolerans dışında) kaçırılan slotlar atlanır
+        next_index = task.slot_index + 1
+        latest_due = math.floor((now - task.anchor - period * LATE_GRACE_FRACTION) / period)
+        if latest_due >= next_index:
+            skipped = latest_due + 1 - next_index
+            self.stats[task.name].missed_slots += skipped
+            if self.metrics:
+                self.metrics.incr(f'schedule.{task.name}.missed_slots', skipped)
+            logger.warning(f"⏭️ {task.name}: {skipped} slot kaçırıldı, sıradaki slota geçiliyor")
+            next_index = latest_due + 1
+        task.slot_index = next_index
+        task.slot_time = task.anchor + next_index * period
+        jitter = task.jitter() if task.jitter else 0.0
+        task.fire_at = task.slot_time + (self.rng.uniform(0, jitter) if jitter > 0 else 0.0)
+
+        task.retrying = False
+        if failed and task.retry_after:
+            retry_at = now + task.retry_after()
+            if retry_at < task.fire_at:
+                # Hata sonrası tekrar deneme; slot sayımı değişmez, sonraki slot yine yerinde
+                task.fire_at = retry_at
+                task.slot_index -= 1
+                task.slot_time = task.anchor + task.slot_index * period
+                task.retrying = True
+
+    def _publish(self, name: str):
+        if not self.metrics:
+            return
+        stats = self.stats[name]
+        if stats.intervals:
+            self.metrics.observe(f'schedule.{name}.interval_seconds', stats.intervals[-1])
+        if stats.lateness:
+            self.metrics.observe(f'schedule.{name}.lateness_seconds', stats.lateness[-1])
+
+    def log_stats(self, log: Optional[logging.Logger] = None):
+        log = log or logger
+        for task in self._tasks:
+            if task.period is None or task.name not in self.stats:
+                continue
+            summary = self.stats[task.name].summary()
+            if summary['avg_interval_seconds'] is None:
+                continue
+            log.info(
+                f"📅 Takvim ({task.name}): {summary['runs']} çalışma, aralık ort {summary['avg_interval_seconds']} sn "
+                f"(hedef {task.current_period:.0f}, en fazla {summary['max_interval_seconds']}), slot gecikmesi ort "
+                f"{summary['avg_lateness_seconds']} / en fazla {summary['max_lateness_seconds']} sn, "
+                f"{summary['missed_slots']} kaçırılan slot"
+            )
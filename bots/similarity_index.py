@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benzer Metin İndeksi
+Daha önce atılmış tweet/cevaplara çok benzeyen yeni metinleri yakalamak için kalıcı
+MinHash/LSH indeksi. Metin karakter shingle'larına bölünür, tek geçişte (one permutation
+hashing) imza çıkarılır ve imza bantlara ayrılarak kovalara konur. Kontrol sırasında
+sadece aynı kovaya düşen aday metinlerle karşılaştırma yapılır, geçmişin tamamı
+taranmaz; böylece geçmiş büyüse de kontrol milisaniyenin altında kalır.
+
+İndeks ../data/<bot>_similarity.jsonl dosyasında saklanır (satır başına bir imza).
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# İmza uzunluğu (2'nin kuvveti) ve LSH bantları: 8 bant x 4 satır ~0.6 benzerlikte aday üretir
+NUM_BINS = 32
+BANDS = 8
+ROWS = NUM_BINS // BANDS
+SHINGLE_SIZE = 4
+EMPTY_BIN = 0xFFFFFFFF
+
+_URL_PATTERN = re.compile(r'https?://\S+|@\w+')
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]+')
+_SPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize(text: str) -> str:
+    """Küçük harf, link/mention ve noktalama temizliği"""
+    text = _URL_PATTERN.sub(' ', text.lower())
+    text = _NON_WORD_PATTERN.sub(' ', text)
+    return _SPACE_PATTERN.sub(' ', text).strip()
+
+
+def signature(text: str) -> Tuple[int, ...]:
+    """Tek geçişli MinHash imzası (her shingle bir kez hash'lenir)"""
+    text = normalize(text)
+    if len(text) < SHINGLE_SIZE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+    bins = [EMPTY_BIN] * NUM_BINS
+    for shingle in shingles:
+        value = zlib.crc32(shingle.encode('utf-8'))
+        index = value & (NUM_BINS - 1)
+        value >>= 5
+        if value < bins[index]:
+            bins[index] = value
+
+    # Boş kalan bölmeleri sağdaki ilk dolu bölmeden doldur (kısa metinler için)
+    if EMPTY_BIN in bins:
+        filled = [i for i, value in enumerate(bins) if value != EMPTY_BIN]
+        if filled:
+            for i in range(NUM_BINS):
+                if bins[i] == EMPTY_BIN:
+                    source = next((j for j in filled if j > i), filled[0])
+                    bins[i] = bins[source] + (source - i) % NUM_BINS
+    return tuple(bins)
+
+
+def estimated_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_BINS
+
+
+class SimilarityIndex:
+    """Kalıcı MinHash/LSH benzerlik indeksi"""
+
+    def __init__(self, name: str, threshold: Callable[[], float], path: Optional[str] = None,
+                 max_entries: int = 5000, metrics=None):
+        self.name = name
+        self.path = path or f'../data/{name}_similarity.jsonl'
+        self._threshold = threshold
+        self.max_entries = max_entries
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._entries: deque = deque()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = defaultdict(set)
+        self._next_id = 0
+        self._load()
+
+    @staticmethod
+    def _bands(sig: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(band, sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+    def _insert(self, sig: Tuple[int, ...], preview: str, added_at: float):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries.append((entry_id, sig, preview, added_at))
+        for band in self._bands(sig):
+            self._buckets[band].add(entry_id)
+        while len(self._entries) > self.max_entries:
+            old_id, old_sig, _, _ = self._entries.popleft()
+            for band in self._bands(old_sig):
+                bucket = self._buckets.get(band)
+                if bucket is not None:
+                    bucket.discard(old_id)
+                    if not bucket:
+                        del self._buckets[band]
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._insert(tuple(entry['sig']), entry.get('text', ''), entry.get('at', 0))
+            logger.info(f"🧬 Benzerlik indeksi yüklendi ({self.name}): {len(self._entries)} kayıt")
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Benzerlik indeksi okunamadı, boş başlanıyor ({self.path}): {e}")
+            self._entries.clear()
+            self._buckets.clear()
+
+    def find_similar(self, text: str) -> Optional[Tuple[float, str]]:
+        """Eşik üstü benzer bir kayıt varsa (benzerlik, önizleme) döndürür"""
+        started = time.perf_counter()
+        sig = signature(text)
+        threshold = self._threshold()
+        best = None
+        with self._lock:
+            candidates = set()
+            for band in self._bands(sig):
+                candidates |= self._buckets.get(band, set())
+            for entry_id in candidates:
+                entry = self._find_entry(entry_id)
+                if entry is None:
+                    continue
+                similarity = estimated_similarity(sig, entry[1])
+                if similarity >= threshold and (best is None or similarity > best[0]):
+                    best = (similarity, entry[2])
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if self.metrics:
+            self.metrics.incr(f"dedup.{self.name}.checks")
+            self.metrics.incr(f"dedup.{self.name}.{'rejected' if best else 'accepted'}")
+            self.metrics.observe(f"dedup.{self.name}.check_ms", elapsed_ms)
+        return best
+
+    def _find_entry(self, entry_id: int):
+        # Kayıtlar id sırasıyla tutulduğu için konum doğrudan hesaplanabilir
+        if not self._entries:
+            return None
+        position = entry_id - self._entries[0][0]
+        if 0 <= position < len(self._entries):
+            return self._entries[position]
+        return None
+
+    def add(self, text: str):
+        """Atılan metni indekse ve dosyaya ekler"""
+        sig = signature(text)
+        preview = text[:80]
+        added_at = time.time()
+        with self._lock:
+            self._insert(sig, preview, added_at)
+            compact = self._next_id % self.max_entries == 0
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if compact:
+                self._rewrite()
+            else:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'sig': list(sig), 'text': preview, 'at': added_at}, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.warning(f"Benzerlik indeksi yazılamadı: {e}")
+
+    def _rewrite(self):
+        """Dosyayı sadece güncel kayıtlarla yeniden yazar (eski satırlar birikmesin)"""
+        with self._lock:
+            entries = list(self._entries)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for _, sig, preview, added_at in entries:
+                f.write(json.dumps({'sig': list(sig), 'text': preview, 'at': added_at}, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
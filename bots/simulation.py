@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sanal Saat Simülasyonu
+Bot'un gerçek run() döngüsünü sanal saatle ve sahte I/O ile (trend sayfaları, Groq,
+Twitter) çalıştırır. Beklemeler anında geçtiği için 24 saatlik çalışma birkaç saniyede
+biter. Sonunda döngü aralıkları, zamanlama kayması ve rate limit'e uyum raporlanır.
+
+Kullanım (bots/ klasöründen):
+    python3 simulation.py trend --hours 24
+    python3 simulation.py reply --hours 24 --post-limit 100 --search-limit 60
+
+Rapor ../logs/<bot>_simulation.json dosyasına da yazılır. Gerçek tweet atılmaz,
+metrik ve benzerlik indeksi dosyaları gerçek çalışmanınkilerden ayrı tutulur.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import List, Optional
+
+from clock import SimulationFinished, VirtualClock
+from similarity_index import SimilarityIndex
+
+logger = logging.getLogger('simulation')
+
+SAMPLE_TRENDS = [
+    "#Pazartesi", "Galatasaray", "Fenerbahçe", "Beşiktaş", "#Dolar", "Asgari Ücret", "#Deprem Tatbikatı",
+    "Mourinho", "#Yağmur", "İstanbul Trafiği", "Kahve", "#YapayZeka", "Metrobüs", "Zam", "Maç Sonucu",
+    "#Cuma", "Netflix", "Simit", "Seçim Anketi", "#KPSS", "Okullar", "Hafta Sonu", "Altın Fiyatları",
+    "#Eurovision", "Kira Artışı", "Bayram Tatili", "#Sınav", "Transfer", "Hakem", "Kadıköy",
+]
+
+SAMPLE_WORDS = [
+    "yine", "bugün", "herkes", "ben", "bence", "galiba", "kesin", "asla", "neden", "sanki", "aslında",
+    "kahve", "simit", "metrobüs", "kira", "maaş", "pazartesi", "kedi", "bakkal", "komşu", "hoca",
+    "uçtu", "bitti", "başladı", "unuttu", "kaçtı", "döndü", "sustu", "güldü", "ağladı", "patladı",
+]
+
+
+class RateLimitStub:
+    """Kayan pencereli sahte rate limit (ör. 24 saatte 100 tweet)"""
+
+    def __init__(self, name: str, limit: int, window_seconds: float, clock: VirtualClock):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.clock = clock
+        self._accepted = deque()
+        self.attempts = 0
+        self.rejected = 0
+        self.max_in_window = 0
+
+    def acquire(self) -> bool:
+        """İstek limit içindeyse True; değilse 429 sayılır"""
+        now = self.clock.time()
+        self.attempts += 1
+        while self._accepted and self._accepted[0] <= now - self.window_seconds:
+            self._accepted.popleft()
+        if len(self._accepted) >= self.limit:
+            self.rejected += 1
+            return False
+        self._accepted.append(now)
+        self.max_in_window = max(self.max_in_window, len(self._accepted))
+        return True
+
+    def report(self) -> dict:
+        return {
+            'limit': self.limit,
+            'window_minutes': self.window_seconds / 60,
+            'attempts': self.attempts,
+            'accepted': self.attempts - self.rejected,
+            'rejected_429': self.rejected,
+            'max_in_window': self.max_in_window,
+        }
+
+
+class Simulation:
+    """Bir bot'u sanal saatle çalıştırıp zamanlama raporu çıkarır"""
+
+    def __init__(self, bot_kind: str, hours: float, seed: int, post_limit: int, post_window_minutes: float,
+                 search_limit: int, search_window_minutes: float):
+        self.bot_kind = bot_kind
+        self.hours = hours
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.clock = VirtualClock(duration=hours * 3600)
+        self.post_limit = RateLimitStub('post', post_limit, post_window_minutes * 60, self.clock)
+        self.search_limit = RateLimitStub('search', search_limit, search_window_minutes * 60, self.clock)
+        self.cycle_starts: List[float] = []
+        # Her döngüden sonra döngünün planladığı bekleme (hedef aralık)
+        self.planned_waits: List[float] = []
+        self.post_times: List[float] = []
+        self.tmp_dir = tempfile.mkdtemp(prefix='bot_simulation_')
+        self._tweet_counter = 0
+        self.bot = self._build_bot()
+
+    # --- Sahte I/O ---
+
+    def _latency(self, low: float, high: float):
+        self.clock.advance(self.rng.uniform(low, high))
+
+    def _fake_text(self, topic: str) -> str:
+        self._tweet_counter += 1
+        words = ' '.join(self.rng.choice(SAMPLE_WORDS) for _ in range(self.rng.randint(8, 16)))
+        return f"{topic} {words} #{self._tweet_counter}"
+
+    def _fake_post(self) -> bool:
+        self._latency(0.3, 1.0)
+        if not self.post_limit.acquire():
+            return False
+        self.post_times.append(self.clock.time())
+        return True
+
+    def _build_bot(self):
+        if self.bot_kind == 'trend':
+            from trend_tweet_bot import TwitterTrendTweetBot
+            bot = TwitterTrendTweetBot(clock=self.clock)
+            name = 'trend_tweet_bot'
+
+            def get_top_10_trends():
+                self._latency(2.0, 6.0)
+                return self.rng.sample(SAMPLE_TRENDS, 10)
+
+            def request_tweet(trend):
+                self._latency(1.0, 3.0)
+                return self._fake_text(trend)
+
+            def generate_tweets_batch(trends):
+                self._latency(1.5, 4.0)
+                return {trend: self._fake_text(trend) for trend in trends}
+
+            bot.get_top_10_trends = get_top_10_trends
+            bot._request_tweet = request_tweet
+            bot.generate_tweets_batch = generate_tweets_batch
+            bot.post_tweet = lambda text: self._fake_post()
+        else:
+            from reply_bot import TwitterReplyBot
+            bot = TwitterReplyBot(clock=self.clock)
+            name = 'reply_bot'
+
+            def search_random_tweets(max_results=10):
+                self._latency(0.5, 1.5)
+                if not self.search_limit.acquire():
+                    return None
+                return [{'id': str(self.rng.randrange(10 ** 18)), 'text': self._fake_text("tweet")}
+                        for _ in range(max_results)]
+
+            def generate_reply_with_ai(tweet_text, is_ataturk_negative=False):
+                self._latency(1.0, 3.0)
+                return self._fake_text("cevap")
+
+            bot.search_random_tweets = search_random_tweets
+            bot.generate_reply_with_ai = generate_reply_with_ai
+            bot.reply_to_tweet = lambda tweet_id, text, original_tweet="": self._fake_post()
+
+        # Gerçek çalışmanın metrik, benzerlik ve durum dosyalarına dokunma
+        bot.metrics.path = os.path.join(self.tmp_dir, f'{name}_metrics.json')
+        bot.similarity = SimilarityIndex(
+            name,
+            threshold=lambda: bot.config.current.similarity['threshold'],
+            path=os.path.join(self.tmp_dir, f'{name}_similarity.jsonl'),
+            metrics=bot.metrics,
+        )
+        bot.state.path = os.path.join(self.tmp_dir, f'{name}_state.json')
+        if self.bot_kind == 'trend':
+            bot.over_budget_path = os.path.join(self.tmp_dir, f'{name}_over_budget.jsonl')
+        if bot.memory:
+            bot.memory.path = os.path.join(self.tmp_dir, f'{name}_memory.jsonl')
+        # Yapılandırma dosyası izleyicisi gerçek zamanlı thread açar, simülasyonda gerek yok
+        bot.config.start = lambda: None
+
+        run_once = bot.run_once
+
+        def recorded_run_once(*args, **kwargs):
+            self.cycle_starts.append(self.clock.time())
+            result = run_once(*args, **kwargs)
+            self.planned_waits.append(self.planned_wait())
+            return result
+
+        bot.run_once = recorded_run_once
+        return bot
+
+    # --- Çalıştırma ve rapor ---
+
+    def planned_wait(self) -> float:
+        """Bu döngüden sonraki döngüye kadar hedeflenen süre (trend bot'ta slot periyodu)"""
+        settings = self.bot.config.current
+        if self.bot_kind == 'trend':
+            return settings.cycle_minutes * 60
+        if self.bot.tweet_queue:
+            return settings.queue_retry_seconds
+        return settings.idle_minutes * 60
+
+    def run(self) -> dict:
+        random.seed(self.seed)
+        wall_started = time.perf_counter()
+        try:
+            self.bot.run()
+        except SimulationFinished:
+            pass
+        return self.report(time.perf_counter() - wall_started)
+
+    def report(self, wall_seconds: float) -> dict:
+        intervals = [b - a for a, b in zip(self.cycle_starts, self.cycle_starts[1:])]
+        planned = self.planned_waits[:len(intervals)]
+        slept = sum(seconds for _, seconds in self.clock.sleeps)
+        simulated = self.clock.elapsed()
+        report = {
+            'bot': self.bot_kind,
+            'seed': self.seed,
+            'simulated_hours': round(simulated / 3600, 2),
+            'wall_seconds': round(wall_seconds, 2),
+            'cycles': len(self.cycle_starts),
+            'cadence': _distribution(intervals, planned),
+            'drift': _drift(intervals, planned),
+            'sleep_seconds': round(slept, 1),
+            'busy_seconds': round(simulated - slept, 1),
+            'posts': self.post_limit.report(),
+        }
+        report['posts']['per_hour_max'] = _max_per_window(self.post_times, 3600)
+        if self.bot_kind == 'reply':
+            report['search'] = self.search_limit.report()
+        else:
+            counters = self.bot.metrics.snapshot()['counters']
+            prefix = 'cycle.over_budget.'
+            report['over_budget'] = {
+                'cycles': int(counters.get('cycle.over_budget', 0)),
+                'by_stage': {key[len(prefix):]: int(value) for key, value in counters.items() if key.startswith(prefix)},
+            }
+        return report
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _distribution(intervals: List[float], planned: List[float]) -> dict:
+    if not intervals:
+        return {}
+    return {
+        'target_seconds': round(sum(planned) / len(planned), 1),
+        'avg_seconds': round(sum(intervals) / len(intervals), 1),
+        'min_seconds': round(min(intervals), 1),
+        'p95_seconds': round(_percentile(intervals, 0.95), 1),
+        'max_seconds': round(max(intervals), 1),
+    }
+
+
+def _drift(intervals: List[float], planned: List[float]) -> dict:
+    """Döngü aralıklarının planlanan beklemeden sapması (iş süresi + döngü içi beklemeler birikir)"""
+    if not intervals:
+        return {}
+    overruns = [interval - wait for interval, wait in zip(intervals, planned)]
+    total = sum(overruns)
+    average_wait = sum(planned) / len(planned)
+    return {
+        'total_seconds': round(total, 1),
+        'per_cycle_seconds': round(total / len(overruns), 1),
+        'max_seconds': round(max(overruns), 1),
+        # Sabit takvimde çalışsaydı bu kadar döngü daha yapılmış olurdu
+        'missed_slots': int(total // average_wait) if total > 0 else 0,
+    }
+
+
+def _max_per_window(times: List[float], window: float) -> int:
+    best, start = 0, 0
+    for end in range(len(times)):
+        while times[end] - times[start] >= window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+def log_report(report: dict):
+    cadence, drift, posts = report['cadence'], report['drift'], report['posts']
+    logger.info("=" * 60)
+    logger.info(f"🧪 SİMÜLASYON RAPORU ({report['bot']}): {report['simulated_hours']} saat, "
+                f"{report['wall_seconds']} sn'de bitti")
+    logger.info("=" * 60)
+    logger.info(f"Döngü sayısı: {report['cycles']}")
+    if cadence:
+        logger.info(f"Döngü aralığı: hedef {cadence['target_seconds']:.0f} sn | ort {cadence['avg_seconds']} sn | "
+                    f"min {cadence['min_seconds']} | p95 {cadence['p95_seconds']} | max {cadence['max_seconds']}")
+    if drift:
+        logger.info(f"Kayma: toplam {drift['total_seconds']} sn, döngü başına {drift['per_cycle_seconds']} sn, "
+                    f"en fazla {drift['max_seconds']} sn, {drift['missed_slots']} kaçırılan slot")
+    logger.info(f"Bekleme: {report['sleep_seconds']} sn | İş (sahte I/O): {report['busy_seconds']} sn")
+    for name in ('posts', 'search'):
+        limit = report.get(name)
+        if not limit:
+            continue
+        status = "✅ uyuldu" if limit['rejected_429'] == 0 else f"❌ {limit['rejected_429']} istek 429 aldı"
+        logger.info(f"Rate limit ({name}): {limit['accepted']}/{limit['attempts']} kabul, limit {limit['limit']} / "
+                    f"{limit['window_minutes']:.0f} dk, pencerede en fazla {limit['max_in_window']} - {status}")
+    logger.info(f"Saatte en fazla tweet: {posts['per_hour_max']}")
+    over_budget = report.get('over_budget')
+    if over_budget is not None:
+        stages = ', '.join(f"{stage}: {count}" for stage, count in over_budget['by_stage'].items()) or "-"
+        logger.info(f"Bütçesi aşılan döngü: {over_budget['cycles']} ({stages})")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bot döngüsünü sanal saatle simüle eder")
+    parser.add_argument('bot', choices=['trend', 'reply'])
+    parser.add_argument('--hours', type=float, default=24)
+    parser.add_argument('--seed', type=int, default=1)
+    # Varsayılanlar Twitter API v2 Basic seviyesine yakın değerler
+    parser.add_argument('--post-limit', type=int, default=100, help="pencere başına tweet limiti")
+    parser.add_argument('--post-window-minutes', type=float, default=24 * 60)
+    parser.add_argument('--search-limit', type=int, default=60, help="pencere başına arama limiti")
+    parser.add_argument('--search-window-minutes', type=float, default=15)
+    parser.add_argument('--report', help="JSON rapor yolu (varsayılan ../logs/<bot>_simulation.json)")
+    parser.add_argument('--verbose', action='store_true', help="bot loglarını da göster")
+    args = parser.parse_args(argv)
+
+    simulation = Simulation(args.bot, args.hours, args.seed, args.post_limit, args.post_window_minutes,
+                            args.search_limit, args.search_window_minutes)
+
+    # Bot modülü import edilince log ayarı yapılıyor; simülasyon çıktısı sadece konsola gitsin
+    root = logging.getLogger()
+    root.handlers = [logging.StreamHandler(sys.stdout)]
+    root.setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+    logger.setLevel(logging.INFO)
+
+    report = simulation.run()
+    log_report(report)
+
+    path = args.report or f'../logs/{args.bot}_simulation.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"Rapor yazıldı: {path}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sıcak Başlangıç Durumu
+Bot yeniden başlatıldığında son görülen rate limit durumunu (uç nokta başına kalan /
+reset), tweet kuyruğunu, son trend listesini ve çıkarma yolu istatistiklerini
+kaybetmesin diye her döngü sonunda ve kapanırken küçük bir JSON dosyasına yazılır
+(../data/<bot>_state.json). Açılışta dosya yaşına göre doğrulanır; eskiyse yok sayılır.
+Rate limit kayıtları ayrıca kendi reset zamanlarına göre ayıklanır.
+"""
+
+import json
+import logging
+import os
+import signal
+import threading
+from typing import Callable, Dict, Optional
+
+from clock import SystemClock
+
+logger = logging.getLogger(__name__)
+
+# Dosya biçimi değişirse artırılır; farklı sürüm yüklenmez
+SNAPSHOT_VERSION = 1
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimits:
+    """Uç nokta başına x-rate-limit-* header'larından görülen son durum"""
+
+    def __init__(self, clock=None):
+        self.clock = clock or SystemClock()
+        self._lock = threading.Lock()
+        # uç nokta -> {'limit', 'remaining', 'reset'}
+        self._limits: Dict[str, dict] = {}
+
+    def update(self, endpoint: str, headers, status_code: Optional[int] = None):
+        """Cevap header'larını kaydeder; 429 geldiyse kalan hak 0 sayılır"""
+        remaining = _int_header(headers, 'x-rate-limit-remaining')
+        reset = _int_header(headers, 'x-rate-limit-reset')
+        if status_code == 429:
+            remaining = 0
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            self._limits[endpoint] = {
+                'limit': _int_header(headers, 'x-rate-limit-limit'),
+                'remaining': remaining,
+                'reset': reset,
+            }
+
+    def blocked_until(self, endpoint: str) -> Optional[float]:
+        """Hak kalmadıysa ve reset zamanı gelmediyse reset zamanını döndürür"""
+        with self._lock:
+            entry = self._limits.get(endpoint)
+        if entry and entry['remaining'] <= 0 and entry['reset'] > self.clock.time():
+            return entry['reset']
+        return None
+
+    def to_dict(self) -> Dict[str, dict]:
+        """Reset zamanı geçmemiş kayıtlar (geçenler zaten bilgi taşımıyor)"""
+        now = self.clock.time()
+        with self._lock:
+            return {endpoint: dict(entry) for endpoint, entry in self._limits.items() if entry['reset'] > now}
+
+    def load_dict(self, data: Dict[str, dict]):
+        now = self.clock.time()
+        with self._lock:
+            for endpoint, entry in data.items():
+                if entry.get('reset', 0) > now and 'remaining' in entry:
+                    self._limits[endpoint] = dict(entry)
+
+
+class StateSnapshot:
+    """Bot durumunu atomik olarak yazar, açılışta yaşını kontrol ederek okur"""
+
+    def __init__(self, name: str, max_age_seconds: Callable[[], float], path: Optional[str] = None,
+                 clock=None, metrics=None):
+        self.name = name
+        self.path = path or f'../data/{name}_state.json'
+        self._max_age_seconds = max_age_seconds
+        self.clock = clock or SystemClock()
+        self.metrics = metrics
+
+    def load(self) -> dict:
+        """Geçerli durum varsa döndürür; dosya yoksa, bozuksa veya eskiyse boş sözlük"""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('bot') != self.name:
+                logger.warning(f"💾 Durum dosyası farklı sürüm/bot için, yok sayılıyor: {self.path}")
+                return {}
+            saved_at = float(snapshot['saved_at'])
+            state = snapshot['state']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"💾 Durum dosyası okunamadı, soğuk başlanıyor ({self.path}): {e}")
+            return {}
+
+        age = self.clock.time() - saved_at
+        max_age = self._max_age_seconds()
+        if age < 0 or age > max_age:
+            logger.info(f"💾 Durum dosyası {age / 60:.0f} dakikalık (sınır {max_age / 60:.0f} dk), soğuk başlanıyor")
+            if self.metrics:
+                self.metrics.incr('state.stale')
+            return {}
+
+        if self.metrics:
+            self.metrics.incr('state.loaded')
+            self.metrics.gauge('state.loaded_age_seconds', round(age, 1))
+        logger.info(f"💾 Önceki durum yüklendi ({age / 60:.1f} dakika önce kaydedilmiş)")
+        return state
+
+    def save(self, state: dict):
+        """Yarım dosya kalmaması için önce geçici dosyaya yazılır"""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'bot': self.name,
+            'saved_at': self.clock.time(),
+            'state': state,
+        }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            if self.metrics:
+                self.metrics.incr('state.saved')
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"💾 Durum dosyası yazılamadı: {e}")
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def stop_on_sigterm():
+    """SIGTERM'i Ctrl+C gibi ele al (servis yöneticisi durdururken durum kaydedilsin)"""
+    try:
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    except ValueError:
+        # Ana thread dışında sinyal kurulamaz
+        pass
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Trend Sayfası İndirici
+Birden fazla bölgenin trend sayfalarını aynı anda indirirken:
+- toplam eşzamanlı bağlantı sayısını sınırlar,
+- aynı siteye art arda istekler arasında nezaket beklemesi koyar,
+- ETag / Last-Modified ile koşullu istek atar (304 gelirse önceki içerik kullanılır),
+- içerik değişmediyse önceki çıkarma sonucunu tekrar kullanır (bkz. parse_memo.py).
+Tüm bölgeler aynı indiriciyi paylaşır.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+
+from clock import SystemClock
+from parse_memo import ParseMemo
+
+logger = logging.getLogger(__name__)
+
+
+class FetchedPage:
+    """İndirilen sayfa içeriği ve cache bilgisi"""
+
+    def __init__(self, url: str, content: bytes, validator: Optional[str], not_modified: bool):
+        self.url = url
+        self.content = content
+        # ETag veya Last-Modified (sayfanın sürümünü belirler)
+        self.validator = validator
+        # Sunucu 304 döndüyse True (içerik cache'ten geldi)
+        self.not_modified = not_modified
+
+
+class TrendPageFetcher:
+    """Bağlantı sınırı, site başına nezaket beklemesi, HTTP cache ve parse hafızası"""
+
+    def __init__(self, session: requests.Session, max_connections: Callable[[], int],
+                 per_host_delay: Callable[[], float], metrics=None, clock=None):
+        self.session = session
+        self.clock = clock or SystemClock()
+        self._max_connections = max_connections
+        self._per_host_delay = per_host_delay
+        self.metrics = metrics
+        self._semaphore_size = max(1, int(max_connections()))
+        self._semaphore = threading.BoundedSemaphore(self._semaphore_size)
+        # site -> sıradaki isteğe ayrılmış son başlama zamanı
+        self._host_last_request: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # url -> (validator header'ları, içerik)
+        self._http_cache: Dict[str, Tuple[dict, bytes]] = {}
+        # İçerik özetine göre parse sonuçları
+        self.parse_memo = ParseMemo(metrics=metrics)
+
+    def _reserve_slot(self, host: str) -> float:
+        """Siteye bir sonraki izinli başlama zamanını ayırır; o zamana kadar beklenecek süreyi döndürür"""
+        delay = self._per_host_delay()
+        with self._lock:
+            now = self.clock.monotonic()
+            last = self._host_last_request.get(host)
+            start = now if last is None else max(now, last + delay)
+            self._host_last_request[host] = start
+        return start - now
+
+    def fetch(self, url: str, timeout: Union[float, Callable[[], float]] = 10,
+              call: Optional[Callable] = None) -> FetchedPage:
+        """Sayfayı indirir; HTTP hatasında exception fırlatır
+
+        timeout çağrılabilirse nezaket beklemesi ve bağlantı sırası bittikten sonra hesaplanır
+        (sırada beklerken geçen süre döngü bütçesinden düşülsün). call verilirse (ör. devre
+        kesicinin call'u) istek onun üzerinden atılır.
+        """
+        host = urlparse(url).netloc
+        cached = self._http_cache.get(url)
+        headers = {}
+        if cached:
+            validators = cached[0]
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        # Aynı siteye istekler aralıklı başlar ama birbirini beklemez; kilit sadece başlama zamanını ayırır
+        wait = self._reserve_slot(host)
+        if wait > 0:
+            self.clock.sleep(wait)
+        with self._semaphore:
+            request_timeout = timeout() if callable(timeout) else timeout
+            response = (call or _call)(self._get, url, headers, request_timeout)
+
+        if response.status_code == 304 and cached:
+            if self.metrics:
+                self.metrics.incr('fetch.http_cache.not_modified')
+            return FetchedPage(url, cached[1], _validator(cached[0]), True)
+
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if validators['etag'] or validators['last_modified']:
+            self._http_cache[url] = (validators, response.content)
+        if self.metrics:
+            self.metrics.incr('fetch.http_cache.full_downloads')
+        return FetchedPage(url, response.content, _validator(validators), False)
+
+    def _get(self, url: str, headers: dict, timeout: float) -> requests.Response:
+        response = self.session.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response
+
+    def cached_parse(self, source: str, page: FetchedPage,
+                     parse: Callable[[FetchedPage], Tuple[List[str], bool]]) -> List[str]:
+        """Sayfa içeriği daha önce parse edildiyse önceki sonucu döndürür, edilmediyse parse eder"""
+        return self.parse_memo.get_or_parse(source, page.url, page.content, lambda: parse(page))
+
+    def run_concurrently(self, tasks: List[Tuple[Hashable, Callable[[], object]]]) -> Dict[Hashable, object]:
+        """İsimli görevleri bağlantı sınırı kadar thread ile çalıştırır"""
+        results = {}
+        workers = max(1, min(len(tasks), int(self._max_connections())))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='trend-fetch') as executor:
+            futures = {name: executor.submit(task) for name, task in tasks}
+            for name, future in futures.items():
+                results[name] = future.result()
+        return results
+
+
+def _call(func: Callable, *args):
+    return func(*args)
+
+
+def _validator(validators: dict) -> Optional[str]:
+    return validators.get('etag') or validators.get('last_modified')
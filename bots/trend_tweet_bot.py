@@ -8,16 +8,31 @@ Her 5 dakikada bir ilk 5 trend'i alır ve AI ile tweet atar.
 import requests
 from bs4 import BeautifulSoup
 import logging
-from datetime import datetime
 import time
 import re
-from typing import List, Set, Optional
+import threading
+from typing import Callable, Dict, List, Set, Optional, Tuple
 from collections import Counter
+from functools import partial
 import json
 import os
 from urllib.parse import unquote
 from dotenv import load_dotenv
 
+import http_cassette
+import memory_profiler
+from bot_config import ConfigWatcher
+from circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from clock import SystemClock
+from cycle_deadline import CycleDeadline, DeadlineExceeded, record_cycle
+from extraction_strategy import ExtractionPath, StrategySelector
+from groq_client import GroqClient, cut_at_sentence
+from trend_fetcher import FetchedPage, TrendPageFetcher
+from metrics import Metrics
+from scheduler import Scheduler
+from similarity_index import SimilarityIndex
+from state_snapshot import RateLimits, StateSnapshot, stop_on_sigterm
+
 # .env dosyasını yükle
 load_dotenv()
 
@@ -35,6 +50,14 @@ try:
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+# Playwright hafif modunda indirilmeyecek kaynaklar (sadece window.trends lazım)
+PLAYWRIGHT_BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+PLAYWRIGHT_BLOCKED_HOSTS = re.compile(
+    r'google-analytics\.com|googletagmanager\.com|googlesyndication\.com|doubleclick\.net|'
+    r'adservice\.google|facebook\.(net|com)|hotjar\.com|scorecardresearch\.com|'
+    r'quantserve\.com|amazon-adsystem\.com|criteo\.(com|net)|taboola\.com|outbrain\.com|yandex\.ru'
+)
+
 # Logging yapılandırması
 logging.basicConfig(
     level=logging.INFO,
@@ -49,7 +72,10 @@ logger = logging.getLogger(__name__)
 
 
 class TwitterTrendTweetBot:
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Zaman ve beklemeler bu saatten alınır (simülasyonda sanal saat verilir)
+        self.clock = clock or SystemClock()
+        
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -64,120 +90,326 @@ class TwitterTrendTweetBot:
         
         # Groq API key (AI tweet'ler için)
         self.groq_api_key = os.getenv('GROQ_API_KEY', '')
+        
+        # Prompt'lar, trend URL'leri ve bekleme süreleri (../config/bot_config.json)
+        self.config = ConfigWatcher('trend_bot')
+        
+        # Metrikler (../logs/trend_tweet_bot_metrics.json)
+        self.metrics = Metrics('trend_tweet_bot')
+        
+        # Her dış kaynak için devre kesici (çökmüş kaynak için timeout beklenmesin)
+        self.breakers = CircuitBreakerRegistry(
+            lambda: self.config.current.circuit_breaker, metrics=self.metrics, clock=self.clock.monotonic
+        )
+        
+        # Tüm bölgelerin paylaştığı indirici (bağlantı sınırı, nezaket beklemesi, HTTP ve parse cache)
+        self.fetcher = TrendPageFetcher(
+            self.session,
+            max_connections=lambda: self.config.current.max_connections,
+            per_host_delay=lambda: self.config.current.per_host_delay_seconds,
+            metrics=self.metrics,
+            clock=self.clock,
+        )
+        
+        # Groq istemcisi (tam veya akış modunda, devre kesici üzerinden)
+        self.groq = GroqClient(self.groq_api_key, self.breakers, metrics=self.metrics)
+        
+        # Atılmış tweet'lerin benzerlik indeksi (aynı espriyi tekrar tekrar atmamak için)
+        self.similarity = SimilarityIndex(
+            'trend_tweet_bot',
+            threshold=lambda: self.config.current.similarity['threshold'],
+            # HTTP kayıt/oynatmada gerçek indeks yerine boş geçici indeks (oynatma kaydı tekrarlasın)
+            path=http_cassette.scratch_path('trend_tweet_bot_similarity.jsonl'),
+            metrics=self.metrics,
+        )
+        
+        # Son trend toplamanın bölge bazında dökümü
+        self.last_region_breakdown = {}
+        
+        # Son başarılı trend listesi ve toplandığı zaman (toplama boş dönerse / sıcak başlangıçta kullanılır)
+        self.last_trends: List[str] = []
+        self.last_trends_at: Optional[float] = None
+        # Durum dosyasından gelen liste yeterince tazeyse ilk döngüde tekrar indirilmez
+        self._warm_trends = False
+        
+        # Tweet atma uç noktasının son görülen rate limit'i (hak yoksa reset'e kadar istek atılmaz)
+        self.rate_limits = RateLimits(clock=self.clock)
+        
+        # Yeniden başlatmada son trendler, rate limit ve çıkarma istatistikleri kaybolmasın
+        self.state = StateSnapshot(
+            'trend_tweet_bot',
+            max_age_seconds=lambda: self.config.current.state_snapshot['max_age_minutes'] * 60,
+            # HTTP kayıt/oynatmada gerçek durum dosyası okunmaz/yazılmaz (oynatma kayıttaki ilk toplamayı atlamasın)
+            path=http_cassette.scratch_path('trend_tweet_bot_state.json'),
+            clock=self.clock,
+            metrics=self.metrics,
+        )
+        
+        # Playwright aynı anda tek tarayıcı açsın (bölgeler paralel çalışıyor)
+        self._playwright_lock = threading.Lock()
+        
+        # Kaç döngü çalıştığı (HTTP kayıt dosyasında döngü işaretleri için)
+        self.cycle_count = 0
+        
+        # Çalışan döngünün süre bütçesi (döngü dışında None); istek zaman aşımları bundan kalanla sınırlanır
+        self.deadline: Optional[CycleDeadline] = None
+        # Bütçesi aşılan döngülerin kaydı
+        self.over_budget_path = '../logs/trend_tweet_bot_over_budget.jsonl'
+        
+        # Döngüleri sabit saat slotlarında çalıştıran zamanlayıcı (run() içinde kurulur)
+        self.scheduler: Optional[Scheduler] = None
+        
+        # BOT_MEMORY_PROFILE=1 ise döngü sonlarında bellek görüntüsü (../logs/trend_tweet_bot_memory.jsonl)
+        self.memory = memory_profiler.from_env('trend_tweet_bot', metrics=self.metrics)
+        
+        # Her kaynak için trend çıkarma yolları; geçmiş başarı ve süreye göre sıralanır.
+        # İkinci değer hiç denenmemiş yol için süre tahmini (saniye): ucuz HTML yolları
+        # Chromium açan Playwright'tan önce denenir.
+        self.extraction = {
+            'trends24': StrategySelector('trends24', [
+                ExtractionPath('trend_card', self._extract_trend_cards, 0.05),
+                ExtractionPath('link_scan', self._extract_trend_links, 0.1),
+            ], metrics=self.metrics),
+            'twitter_trending': StrategySelector('twitter_trending', [
+                ExtractionPath('json_ld', self._extract_json_ld, 0.05),
+                ExtractionPath('table_bodies', self._extract_trends_from_table_bodies, 0.1),
+                ExtractionPath('playwright', self._extract_with_playwright, 20.0, from_content=False),
+            ], metrics=self.metrics),
+        }
 
-    def get_trends24_trends(self) -> List[str]:
-        """trends24.in sitesinden trendleri çeker"""
+    def restore_state(self):
+        """Önceki çalışmadan kalan trend listesini, rate limit ve çıkarma istatistiklerini yükler"""
+        if not self.config.current.state_snapshot['enabled']:
+            return
+        state = self.state.load()
+        self.rate_limits.load_dict(state.get('rate_limits') or {})
+        for source, stats in (state.get('extraction') or {}).items():
+            if source in self.extraction:
+                self.extraction[source].load_stats(stats)
+        last = state.get('last_trends') or {}
+        if last.get('trends') and last.get('collected_at'):
+            self.last_trends = list(last['trends'])
+            self.last_trends_at = float(last['collected_at'])
+            self._warm_trends = True
+        reset = self.rate_limits.blocked_until('tweets_post')
+        if reset:
+            logger.info(f"⏳ Tweet atma hakkı yok, reset: {time.ctime(reset)} (o zamana kadar istek atılmayacak)")
+
+    def save_state(self):
+        if not self.config.current.state_snapshot['enabled']:
+            return
+        self.state.save({
+            'rate_limits': self.rate_limits.to_dict(),
+            'last_trends': {'trends': self.last_trends, 'collected_at': self.last_trends_at},
+            'extraction': {source: selector.stats() for source, selector in self.extraction.items()},
+        })
+
+    def _last_trends_age(self) -> Optional[float]:
+        if not self.last_trends or self.last_trends_at is None:
+            return None
+        return self.clock.time() - self.last_trends_at
+
+    def _io_timeout(self, default: float) -> float:
+        """İstek zaman aşımı: döngü bütçesinden kalan süreyle sınırlı (süre dolduysa DeadlineExceeded)"""
+        if self.deadline is None:
+            return default
+        return self.deadline.timeout(default)
+
+    def get_trends24_trends(self, url: Optional[str] = None) -> List[str]:
+        """trends24.in sitesinden trendleri çeker (url verilmezse ana bölge)"""
         try:
-            url = "https://trends24.in/turkey/"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            trends = []
-            
-            # Timeline'daki trendleri bul
-            timeline_sections = soup.find_all('div', class_='trend-card')
+            url = url or self.config.current.regions[0]['trends24']
+            # Zaman aşımı sırada beklendikten sonra hesaplanır; devre kesici sadece HTTP isteğini sayar
+            page = self.fetcher.fetch(url, lambda: self._io_timeout(10), call=self.breakers.get('trends24').call)
             
-            # En güncel timeline bölümünü al (ilk olan)
-            if timeline_sections:
-                trend_items = timeline_sections[0].find_all('li')
-                for item in trend_items[:20]:  # İlk 20 trend
-                    text = item.get_text(strip=True)
-                    if text:
-                        # Sayıları ve "K" gibi karakterleri temizle
-                        text = re.sub(r'\d+K?\s*$', '', text).strip()
-                        if text and text not in trends:
-                            trends.append(text)
-            
-            # Eğer timeline bulunamazsa, alternatif yöntem dene
-            if not trends:
-                # Table veya tag cloud'dan trendleri bul
-                trend_links = soup.find_all('a', href=re.compile(r'/turkey/'))
-                for link in trend_links[:30]:
-                    text = link.get_text(strip=True)
-                    if text and '#' in text or len(text) > 2:
-                        trends.append(text)
+            # Sayfa değişmediyse önceki sonuç kullanılır, değiştiyse parse edilir
+            trends = self.fetcher.cached_parse('trends24', page, self._parse_trends24_page)
             
-            logger.info(f"trends24.in'den {len(trends)} trend bulundu")
+            logger.info(f"trends24.in'den ({url}) {len(trends)} trend bulundu")
             return trends[:20]  # İlk 20 trend
             
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            logger.warning(f"⏭️ trends24.in atlandı: {e}")
+            return []
         except Exception as e:
             logger.error(f"trends24.in'den trend çekilirken hata: {e}")
             return []
 
-    def get_twitter_trending_trends(self) -> List[str]:
-        """twitter-trending.com sitesinden son 1 saat içindeki trendleri çeker"""
+    def _parse_trends24_page(self, page: FetchedPage) -> Tuple[List[str], bool]:
+        soup = BeautifulSoup(page.content, 'html.parser')
+        
+        # Geçmişte en iyi çalışan yol önce denenir (timeline kartları / link taraması)
+        trends, path = self.extraction['trends24'].run(soup, page.url)
+        logger.debug(f"trends24.in çıkarma yolu: {path or 'hiçbiri'}")
+        return trends, self.extraction['trends24'].from_content(path)
+
+    def _extract_trend_cards(self, soup: BeautifulSoup, url: str) -> List[str]:
+        """trends24.in timeline kartlarından (trend-card) trendleri çıkarır"""
+        trends = []
+        
+        # Timeline'daki trendleri bul
+        timeline_sections = soup.find_all('div', class_='trend-card')
+        
+        # En güncel timeline bölümünü al (ilk olan)
+        if timeline_sections:
+            trend_items = timeline_sections[0].find_all('li')
+            for item in trend_items[:20]:  # İlk 20 trend
+                text = item.get_text(strip=True)
+                if text:
+                    # Sayıları ve "K" gibi karakterleri temizle
+                    text = re.sub(r'\d+K?\s*$', '', text).strip()
+                    if text and text not in trends:
+                        trends.append(text)
+        return trends
+
+    def _extract_trend_links(self, soup: BeautifulSoup, url: str) -> List[str]:
+        """trends24.in table veya tag cloud linklerinden trendleri çıkarır (alternatif yöntem)"""
+        trends = []
+        trend_links = soup.find_all('a', href=re.compile(r'/turkey/'))
+        for link in trend_links[:30]:
+            text = link.get_text(strip=True)
+            if text and '#' in text or len(text) > 2:
+                trends.append(text)
+        return trends
+
+    def get_twitter_trending_trends(self, url: Optional[str] = None) -> List[str]:
+        """twitter-trending.com sitesinden son 1 saat içindeki trendleri çeker (url verilmezse ana bölge)"""
         try:
-            trends = []
-            url = "https://www.twitter-trending.com/turkey/tr"
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Önce JSON-LD structured data'dan çek (hızlı ve güvenilir)
-            json_ld_script = soup.find('script', type='application/ld+json')
-            if json_ld_script:
-                try:
-                    structured_data = json.loads(json_ld_script.string)
-                    if 'itemListElement' in structured_data:
-                        # İlk 10 trend'i al (son 1 saat için yeterli)
-                        for item in structured_data['itemListElement'][:10]:
-                            trend_name = item.get('name', '').strip()
-                            if trend_name and trend_name not in trends:
-                                trends.append(trend_name)
-                        if trends:
-                            logger.info(f"twitter-trending.com'dan (JSON-LD - son 1 saat) {len(trends)} trend bulundu")
-                            return trends[:20]
-                except Exception as e:
-                    logger.debug(f"JSON-LD parse hatası: {e}")
-            
-            # Playwright ile JavaScript'i çalıştırarak verileri çek
-            if PLAYWRIGHT_AVAILABLE and not trends:
-                try:
-                    with sync_playwright() as p:
-                        browser = p.chromium.launch(headless=True)
-                        page = browser.new_page()
-                        page.goto(url, wait_until='networkidle', timeout=30000)
-                        
-                        # JavaScript'in çalışmasını bekle
-                        page.wait_for_function('window.trends && typeof window.trends === "string"', timeout=15000)
-                        
-                        # window.trends değişkenini al
-                        trends_json = page.evaluate('window.trends')
-                        browser.close()
-                        
-                        if trends_json:
-                            data = json.loads(trends_json)
-                            
-                            # table1 (10 dakika önce) ve table2 (1 saat önce) içindeki trendleri al
-                            for table_key in ['table1', 'table2']:
-                                if table_key in data and 'trends' in data[table_key]:
-                                    table_trends = data[table_key]['trends']
-                                    for trend_key, trend_value in table_trends.items():
-                                        trend_data = json.loads(trend_value)
-                                        trend_name = trend_data[0]
-                                        trend_name = unquote(trend_name).replace('+', ' ').strip()
-                                        if trend_name and trend_name not in trends:
-                                            trends.append(trend_name)
-                            
-                            if trends:
-                                logger.info(f"twitter-trending.com'dan (Playwright - son 1 saat) {len(trends)} trend bulundu")
-                                return trends[:20]
-                except Exception as e:
-                    logger.warning(f"Playwright ile yükleme başarısız: {e}")
+            url = url or self.config.current.regions[0]['twitter_trending']
+            # Zaman aşımı sırada beklendikten sonra hesaplanır; devre kesici sadece HTTP isteğini sayar
+            page = self.fetcher.fetch(url, lambda: self._io_timeout(10), call=self.breakers.get('twitter_trending').call)
             
-            # Son çare: HTML'den tableBody'leri çek
-            if not trends:
-                trends = self._extract_trends_from_table_bodies(soup)
+            # Sayfa değişmediyse önceki sonuç kullanılır, değiştiyse parse edilir
+            trends = self.fetcher.cached_parse('twitter_trending', page, self._parse_twitter_trending_page)
             
-            logger.info(f"twitter-trending.com'dan (son 1 saat) {len(trends)} trend bulundu")
+            logger.info(f"twitter-trending.com'dan ({url} - son 1 saat) {len(trends)} trend bulundu")
             return trends[:20]
             
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            logger.warning(f"⏭️ twitter-trending.com atlandı: {e}")
+            return []
         except Exception as e:
             logger.error(f"twitter-trending.com'dan trend çekilirken hata: {e}")
             return []
+
+    def _parse_twitter_trending_page(self, page: FetchedPage) -> Tuple[List[str], bool]:
+        soup = BeautifulSoup(page.content, 'html.parser')
+        
+        # Geçmişte en iyi çalışan yol önce denenir (JSON-LD / tableBody / Playwright)
+        trends, path = self.extraction['twitter_trending'].run(soup, page.url)
+        logger.debug(f"twitter-trending.com çıkarma yolu: {path or 'hiçbiri'}")
+        # Sayfayı yeniden yükleyen yolların sonucu bu içeriğe bağlı değil, saklanmaz
+        return trends, self.extraction['twitter_trending'].from_content(path)
+
+    def _extract_json_ld(self, soup: BeautifulSoup, url: str) -> List[str]:
+        """JSON-LD structured data'dan trendleri çıkarır (hızlı ve güvenilir)"""
+        trends = []
+        json_ld_script = soup.find('script', type='application/ld+json')
+        if json_ld_script:
+            try:
+                structured_data = json.loads(json_ld_script.string)
+                if 'itemListElement' in structured_data:
+                    # İlk 10 trend'i al (son 1 saat için yeterli)
+                    for item in structured_data['itemListElement'][:10]:
+                        trend_name = item.get('name', '').strip()
+                        if trend_name and trend_name not in trends:
+                            trends.append(trend_name)
+            except Exception as e:
+                logger.debug(f"JSON-LD parse hatası: {e}")
+        return trends
+
+    def _extract_with_playwright(self, soup: BeautifulSoup, url: str) -> List[str]:
+        """Playwright ile JavaScript'i çalıştırarak window.trends'ten trendleri çıkarır"""
+        # HTTP kayıt/oynatma modunda tarayıcı trafiği kaydedilemediği için atlanır
+        if not PLAYWRIGHT_AVAILABLE or http_cassette.is_active():
+            return []
+        
+        trends = []
+        try:
+            with self._playwright_lock:
+                # Sayfa yükleme (30 sn) + window.trends bekleme (15 sn), döngü bütçesinden kalanla sınırlı
+                budget = self._io_timeout(45)
+                trends_json = self.breakers.get('twitter_trending_playwright').call(
+                    self._load_trends_json_with_playwright, url, budget
+                )
+            if trends_json:
+                data = json.loads(trends_json)
+                
+                # table1 (10 dakika önce) ve table2 (1 saat önce) içindeki trendleri al
+                for table_key in ['table1', 'table2']:
+                    if table_key in data and 'trends' in data[table_key]:
+                        table_trends = data[table_key]['trends']
+                        for trend_key, trend_value in table_trends.items():
+                            trend_data = json.loads(trend_value)
+                            trend_name = trend_data[0]
+                            trend_name = unquote(trend_name).replace('+', ' ').strip()
+                            if trend_name and trend_name not in trends:
+                                trends.append(trend_name)
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            logger.info(f"⏭️ Playwright atlandı: {e}")
+        except Exception as e:
+            logger.warning(f"Playwright ile yükleme başarısız: {e}")
+        return trends
     
-    def _extract_trends_from_table_bodies(self, soup: BeautifulSoup) -> List[str]:
+    def _load_trends_json_with_playwright(self, url: str, budget: float = 45) -> Optional[str]:
+        """Sayfayı Chromium ile açıp window.trends değişkenini döndürür (toplam en fazla budget saniye)"""
+        lean = self.config.current.lean_playwright
+        mode = 'lean' if lean else 'full'
+        finished_requests = []
+        blocked = [0]
+        
+        def block_heavy_resources(route):
+            # Görsel, medya, font ve analitik isteklerini indirmeden iptal et
+            request = route.request
+            if request.resource_type in PLAYWRIGHT_BLOCKED_RESOURCE_TYPES or PLAYWRIGHT_BLOCKED_HOSTS.search(request.url):
+                blocked[0] += 1
+                route.abort()
+            else:
+                route.continue_()
+        
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            try:
+                page = browser.new_page()
+                page.on('requestfinished', finished_requests.append)
+                if lean:
+                    page.route('**/*', block_heavy_resources)
+                
+                started = time.perf_counter()
+                if lean:
+                    # Tüm kaynakları beklemeden HTML hazır olunca devam et; asıl beklenen veri window.trends
+                    page.goto(url, wait_until='domcontentloaded', timeout=min(30, budget) * 1000)
+                else:
+                    page.goto(url, wait_until='networkidle', timeout=min(30, budget) * 1000)
+                
+                # JavaScript'in çalışmasını bekle (bütçeden kalan süre kadar)
+                wait_seconds = max(1.0, min(15, budget - (time.perf_counter() - started)))
+                page.wait_for_function('window.trends && typeof window.trends === "string"', timeout=wait_seconds * 1000)
+                
+                # window.trends değişkenini al
+                trends_json = page.evaluate('window.trends')
+                load_seconds = time.perf_counter() - started
+                
+                transferred = 0
+                for request in finished_requests:
+                    try:
+                        sizes = request.sizes()
+                        transferred += sizes.get('responseHeadersSize', 0) + sizes.get('responseBodySize', 0)
+                    except Exception:
+                        pass
+                
+                logger.info(
+                    f"🌐 Playwright ({mode}): {load_seconds:.1f} sn, {transferred / 1024:.0f} KB aktarıldı, "
+                    f"{len(finished_requests)} istek tamamlandı, {blocked[0]} istek engellendi"
+                )
+                self.metrics.observe(f'playwright.{mode}.load_seconds', load_seconds)
+                self.metrics.observe(f'playwright.{mode}.transferred_bytes', transferred)
+                self.metrics.incr(f'playwright.{mode}.blocked_requests', blocked[0])
+                return trends_json
+            finally:
+                browser.close()
+    
+    def _extract_trends_from_table_bodies(self, soup: BeautifulSoup, url: str = None) -> List[str]:
         """tableBody1 ve tableBody2'den trendleri çıkarır"""
         trends = []
         table_bodies = ['tableBody1', 'tableBody2']
@@ -208,17 +440,46 @@ class TwitterTrendTweetBot:
         
         return trends
 
+    def collect_region_trends(self) -> Dict[str, Dict[str, List[str]]]:
+        """Tüm bölgelerin trendlerini paralel çeker: {bölge: {kaynak: trendler}}"""
+        regions = self.config.current.regions
+        tasks = []
+        for region in regions:
+            if region.get('trends24'):
+                tasks.append(((region['name'], 'trends24'), partial(self.get_trends24_trends, region['trends24'])))
+            if region.get('twitter_trending'):
+                tasks.append(((region['name'], 'twitter_trending'), partial(self.get_twitter_trending_trends, region['twitter_trending'])))
+        
+        results = self.fetcher.run_concurrently(tasks)
+        
+        breakdown = {region['name']: {} for region in regions}
+        for (region_name, source), trends in results.items():
+            breakdown[region_name][source] = trends
+        return breakdown
+
     def get_top_10_trends(self) -> List[str]:
-        """Her iki siteden trendleri çeker ve en popüler 10'unu döndürür"""
+        """Tüm bölgelerde her iki siteden trendleri çeker ve en popüler 10'unu döndürür"""
+        # Sıcak başlangıç: durum dosyasındaki liste bir döngü süresinden tazeyse siteler tekrar indirilmez
+        if self._warm_trends:
+            self._warm_trends = False
+            age = self._last_trends_age()
+            if age is not None and age < self.config.current.cycle_minutes * 60:
+                logger.info(f"💾 Önceki çalışmanın trend listesi kullanılıyor ({age / 60:.1f} dakika önce toplanmış)")
+                self.metrics.incr('state.warm_trends_used')
+                return list(self.last_trends)
+        
         logger.info("Trend verileri çekiliyor...")
+        started = time.perf_counter()
         
-        trends1 = self.get_trends24_trends()
-        trends2 = self.get_twitter_trending_trends()
+        breakdown = self.collect_region_trends()
+        # Çıkarma uyarısı için boş döngü sayımı sayfa değil döngü başına (bölgeler aynı seçiciyi paylaşıyor)
+        for selector in self.extraction.values():
+            selector.end_cycle()
         
-        # Her iki listedeki trendleri birleştir
-        all_trends = trends1 + trends2
+        # Tüm bölge ve sitelerdeki trendleri birleştir (ana bölge önce, eşitlikte öne geçer)
+        all_trends = [trend for sources in breakdown.values() for trends in sources.values() for trend in trends]
         
-        # Trendleri say (her iki sitede de görünenler daha önemli)
+        # Trendleri say (birden fazla site/bölgede görünenler daha önemli)
         trend_counter = Counter(all_trends)
         
         # En popüler 10 trendi al
@@ -228,51 +489,42 @@ class TwitterTrendTweetBot:
         if len(top_trends) < 10:
             remaining = [t for t in all_trends if t not in top_trends]
             top_trends.extend(remaining[:10 - len(top_trends)])
+        top_trends = top_trends[:10]
         
-        logger.info(f"Toplam {len(top_trends)} trend bulundu")
-        return top_trends[:10]
-
-    def generate_tweet_with_ai(self, trend: str) -> Optional[str]:
-        """Groq API ile trend için ağır troll tweet yazar (ama yasal sınırlar içinde)"""
-        if not self.groq_api_key:
-            logger.warning("Groq API key bulunamadı!")
-            return None
-            
-        try:
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.groq_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            prompt = f"Türkçe bir Twitter tweet'i yaz. Konu: {trend}. Tweet ağır troll, absürt, karanlık mizah içermeli ama kesinlikle yasal sınırlar içinde kalmalı. Hakaret, küfür, kişisel saldırı, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazma. Sadece absürt, saçma, komik, ironik ve troll bir yorum yap. Günlük konuşma dilinde, samimi ama absürt olsun. Maksimum 250 karakter. Sadece tweet metnini yaz, başka açıklama ekleme."
-            
-            payload = {
-                "model": "llama-3.3-70b-versatile",  # Daha iyi ve güçlü model
-                "messages": [
-                    {"role": "system", "content": "Sen Türkçe ağır troll tweet'ler yazan bir asistansın. Absürt, karanlık mizah, ironik ve komik tweet'ler yazarsın. Ama kesinlikle yasal sınırlar içinde kalırsın - hakaret, küfür, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazmazsın. Sadece absürt ve komik olursun."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 1.2,  # Daha yaratıcı ve absürt olması için
-                "max_tokens": 200
+        elapsed = time.perf_counter() - started
+        self.metrics.observe('trends.collect_seconds', elapsed)
+        
+        # Bölge bazında döküm: her kaynaktan kaç trend geldi, seçilen 10'un kaçı bu bölgede var
+        self.last_region_breakdown = {}
+        for region_name, sources in breakdown.items():
+            region_trends = {trend for trends in sources.values() for trend in trends}
+            self.last_region_breakdown[region_name] = {
+                'sources': {source: len(trends) for source, trends in sources.items()},
+                'top_trends': [trend for trend in top_trends if trend in region_trends],
             }
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=15)
-            
-            if response.status_code == 200:
-                result = response.json()
-                tweet = result['choices'][0]['message']['content'].strip()
-                
-                # 280 karakter limiti
-                if len(tweet) > 280:
-                    tweet = tweet[:277] + "..."
-                
-                return tweet
-                
-        except Exception as e:
-            logger.error(f"Groq API hatası: {e}")
-            
-        return None
+        
+        if len(breakdown) > 1:
+            for region_name, summary in self.last_region_breakdown.items():
+                counts = ', '.join(f"{source}={count}" for source, count in summary['sources'].items())
+                logger.info(f"   📍 {region_name}: {counts} | ilk 10'da {len(summary['top_trends'])} trend")
+        
+        logger.info(f"Toplam {len(top_trends)} trend bulundu ({len(breakdown)} bölge, {elapsed:.1f} sn)")
+        memo = self.fetcher.parse_memo.stats()
+        if memo['hits']:
+            logger.info(f"🧠 Parse hafızası: %{memo['hit_rate'] * 100:.0f} isabet ({memo['hits']}/{memo['hits'] + memo['misses']}), "
+                        f"toplam {memo['saved_seconds']:.2f} sn parse tasarrufu")
+        
+        if top_trends:
+            self.last_trends = list(top_trends)
+            self.last_trends_at = self.clock.time()
+        else:
+            # Tüm kaynaklar boş döndü: son liste hâlâ geçerliyse onunla devam et
+            age = self._last_trends_age()
+            if age is not None and age <= self.config.current.state_snapshot['max_age_minutes'] * 60:
+                logger.warning(f"⚠️ Trend bulunamadı, {age / 60:.0f} dakika önceki liste kullanılıyor")
+                self.metrics.incr('state.stale_trends_used')
+                return list(self.last_trends)
+        return top_trends
 
     def post_tweet(self, text: str) -> bool:
         """Twitter'a tweet at (API ile gerçek tweet atar)"""
@@ -292,7 +544,14 @@ class TwitterTrendTweetBot:
                 "text": text
             }
             
-            response = requests.post(url, json=tweet_data, auth=auth, timeout=10)
+            # Son cevaptan hak kalmadığı biliniyorsa reset'e kadar istek atma (boşuna 429 alınmasın)
+            reset = self.rate_limits.blocked_until('tweets_post')
+            if reset:
+                logger.warning(f"⏳ Tweet atma hakkı yok, reset: {time.ctime(reset)} - istek atılmadı")
+                return False
+            
+            response = requests.post(url, json=tweet_data, auth=auth, timeout=self._io_timeout(10))
+            self.rate_limits.update('tweets_post', response.headers, response.status_code)
             
             if response.status_code == 201:
                 result = response.json()
@@ -303,12 +562,34 @@ class TwitterTrendTweetBot:
                 logger.error(f"❌ Tweet atma hatası: {response.status_code} - {response.text}")
                 return False
                 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"❌ Tweet atma hatası: {e}")
             return False
 
     def generate_tweet_with_ai(self, trend: str) -> Optional[str]:
-        """Tek bir trend için ağır troll tweet yazar"""
+        """Tek bir trend için ağır troll tweet yazar; önceki tweet'lere çok benzerse bir kez yeniden üretir"""
+        for _ in range(2):
+            tweet = self._request_tweet(trend)
+            if not tweet or not self.is_repeat(tweet):
+                return tweet
+        logger.warning(f"♻️ '{trend}' için üretilen tweet'ler öncekilere çok benziyor, atlanıyor")
+        self.metrics.incr('dedup.trend_tweet_bot.skipped')
+        return None
+
+    def is_repeat(self, text: str) -> bool:
+        """Metin daha önce atılmış bir tweet'e çok benziyor mu?"""
+        if not self.config.current.similarity['enabled']:
+            return False
+        match = self.similarity.find_similar(text)
+        if match:
+            logger.info(f"♻️ Önceki bir tweet'e %{match[0] * 100:.0f} benziyor: {match[1]}")
+            return True
+        return False
+
+    def _request_tweet(self, trend: str) -> Optional[str]:
+        """Groq'tan tek bir trend için tweet ister"""
         if not self.groq_api_key:
             logger.warning("Groq API key bulunamadı!")
             return None
@@ -317,54 +598,179 @@ class TwitterTrendTweetBot:
             return None
             
         try:
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.groq_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            prompt = f"Türkçe bir Twitter tweet'i yaz. Konu: {trend}. Tweet ağır troll, absürt, karanlık mizah içermeli ama kesinlikle yasal sınırlar içinde kalmalı. Hakaret, küfür, kişisel saldırı, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazma. Sadece absürt, saçma, komik, ironik ve troll bir yorum yap. Günlük konuşma dilinde, samimi ama absürt olsun. Maksimum 250 karakter. Sadece tweet metnini yaz, başka açıklama ekleme."
+            settings = self.config.current
+            prompt = settings.tweet_prompt.render(trend=trend)
             
-            payload = {
-                "model": "llama-3.3-70b-versatile",  # Daha iyi ve güçlü model
-                "messages": [
-                    {"role": "system", "content": "Sen Türkçe ağır troll tweet'ler yazan bir asistansın. Absürt, karanlık mizah, ironik ve komik tweet'ler yazarsın. Ama kesinlikle yasal sınırlar içinde kalırsın - hakaret, küfür, nefret söylemi, şiddet içerikli veya yasadışı hiçbir şey yazmazsın. Sadece absürt ve komik olursun."},
+            completion = self.groq.generate(
+                [
+                    {"role": "system", "content": settings.system_prompt},
                     {"role": "user", "content": prompt}
                 ],
-                "temperature": 1.2,  # Daha yaratıcı ve absürt olması için
-                "max_tokens": 200
-            }
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=15)
-            
-            if response.status_code == 200:
-                result = response.json()
-                tweet = result['choices'][0]['message']['content'].strip()
-                
-                # 280 karakter limiti
-                if len(tweet) > 280:
-                    tweet = tweet[:277] + "..."
-                
-                return tweet
+                settings.temperature,
+                models=settings.models['tiers'],
+                latency_budget=settings.models['latency_budget_seconds'],
+                timeout=settings.models['timeout_seconds'],
+                deadline=self.deadline,
+                stream=settings.stream_generation,
+            )
+            self._record_prompt_tokens('single', completion.usage, 1)
+            
+            # 280 karakter limiti (cümle sınırından kesilmiş olarak gelir)
+            return completion.text or None
                 
+        except DeadlineExceeded:
+            raise
+        except CircuitOpenError as e:
+            logger.warning(f"⏭️ Groq atlandı: {e}")
         except Exception as e:
             logger.error(f"Groq API hatası: {e}")
             
         return None
 
-    def run_once(self):
-        """Bir kez çalıştır: 10 trend al, rastgele 2 tanesini seç, her biri için tweet at"""
+    def generate_tweets_batch(self, trends: List[str]) -> Dict[str, str]:
+        """Tüm trendler için tweet'leri tek Groq isteğinde (JSON çıktı) üretir.
+        
+        Sadece geçerli tweet'ler döner; eksik kalan trendler için tekli üretime düşülür.
+        """
+        if not self.groq_api_key or not trends:
+            return {}
+        
+        try:
+            settings = self.config.current
+            trend_list = "\n".join(f"{i}. {trend}" for i, trend in enumerate(trends, 1))
+            prompt = settings.batch_prompt.render(trends=trend_list)
+            
+            # JSON çıktı kesilemeyeceği için toplu üretim her zaman tam modda
+            completion = self.groq.generate(
+                [
+                    {"role": "system", "content": settings.system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                settings.temperature,
+                models=settings.models['tiers'],
+                # Toplu cevap trend sayısı kadar uzun; bütçe ve zaman aşımı da ona göre
+                latency_budget=settings.models['latency_budget_seconds'] * len(trends),
+                max_tokens=200 * len(trends),
+                char_limit=None,
+                timeout=max(30, settings.models['timeout_seconds']),
+                deadline=self.deadline,
+                label='batch',
+                response_format={"type": "json_object"},
+            )
+            
+            tweets = self._parse_batch_tweets(completion.text, trends)
+            self._report_batch_savings(completion.usage, trends, prompt)
+            logger.info(f"🧺 Toplu üretim: {len(tweets)}/{len(trends)} trend için geçerli tweet alındı")
+            self.metrics.incr('groq.batch.valid_items', len(tweets))
+            self.metrics.incr('groq.batch.invalid_items', len(trends) - len(tweets))
+            return tweets
+            
+        except DeadlineExceeded:
+            raise
+        except CircuitOpenError as e:
+            logger.warning(f"⏭️ Groq atlandı: {e}")
+        except Exception as e:
+            logger.warning(f"⚠️ Toplu tweet üretimi başarısız, tekli üretime geçiliyor: {e}")
+        
+        return {}
+
+    def _parse_batch_tweets(self, content: str, trends: List[str]) -> Dict[str, str]:
+        """{"tweets": [{"id": 1, "tweet": "..."}]} cevabını trend -> tweet sözlüğüne çevirir"""
+        data = json.loads(content)
+        items = data.get('tweets') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise ValueError("JSON içinde 'tweets' listesi yok")
+        
+        tweets = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get('id')
+            tweet = item.get('tweet')
+            if isinstance(index, str) and index.isdigit():
+                index = int(index)
+            if not isinstance(index, int) or not 1 <= index <= len(trends):
+                continue
+            if not isinstance(tweet, str):
+                continue
+            tweet = tweet.strip().strip('"').strip()
+            trend = trends[index - 1]
+            if not tweet or trend in tweets or tweet in tweets.values():
+                continue
+            
+            # 280 karakter limiti
+            tweets[trend] = cut_at_sentence(tweet)
+        return tweets
+
+    def _record_prompt_tokens(self, mode: str, usage: dict, item_count: int):
+        prompt_tokens = usage.get('prompt_tokens')
+        if prompt_tokens:
+            self.metrics.observe(f'groq.{mode}.prompt_tokens_per_trend', prompt_tokens / item_count)
+
+    def _report_batch_savings(self, usage: dict, trends: List[str], batch_prompt: str):
+        """Toplu isteğin prompt token'ını, aynı trendler için tekli isteklerin tahmini ile karşılaştırır"""
+        prompt_tokens = usage.get('prompt_tokens')
+        if not prompt_tokens:
+            return
+        self._record_prompt_tokens('batch', usage, len(trends))
+        
+        # Token/karakter oranını toplu istekten çıkarıp tekli prompt'ların uzunluğuna uygula
+        settings = self.config.current
+        batch_chars = len(settings.system_prompt) + len(batch_prompt)
+        single_chars = sum(
+            len(settings.system_prompt) + len(settings.tweet_prompt.render(trend=trend)) for trend in trends
+        )
+        estimated_single = round(prompt_tokens * single_chars / batch_chars)
+        saved = estimated_single - prompt_tokens
+        saved_percent = 100 * saved / estimated_single if estimated_single else 0
+        
+        self.metrics.incr('groq.batch.prompt_tokens_saved', saved)
+        self.metrics.incr('groq.batch.round_trips_saved', len(trends) - 1)
+        logger.info(
+            f"📉 Toplu üretim: {len(trends)} trend, 1 istek, {prompt_tokens} prompt token "
+            f"(tekli tahmini {estimated_single}, %{saved_percent:.0f} tasarruf, trend başına {prompt_tokens / len(trends):.0f})"
+        )
+
+    def run_once(self, defer: Optional[Callable[[float, Callable[[], None]], None]] = None):
+        """Bir kez çalıştır: 10 trend al, rastgele 2 tanesini seç, her biri için tweet at
+        
+        defer verilirse ikinci tweet için beklenmez; defer(saniye, iş) ile sonraya planlanır
+        (zamanlayıcı bu sürede bir sonraki döngüyü geciktirmeden bekler).
+        """
         logger.info("")
         logger.info("=" * 60)
-        logger.info(f"TREND TWEET BOT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info(f"TREND TWEET BOT - {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info("=" * 60)
         
+        self.cycle_count += 1
+        http_cassette.mark_cycle(self.cycle_count)
+        
+        # Döngünün tamamı (bekleme dahil) bu bütçeyi aşamaz; süre dolunca kalan işler iptal edilir
+        deadline = CycleDeadline(self.config.current.cycle_deadline_seconds, clock=self.clock)
+        self._run_with_deadline(deadline, self.cycle_count, lambda: self._run_cycle(deadline, defer))
+
+    def _run_with_deadline(self, deadline: CycleDeadline, cycle: int, work: Callable[[], bool]):
+        """work'ü döngü bütçesiyle çalıştırır; iş sonraya planlanmadıysa döngü kaydını yazar"""
+        self.deadline = deadline
+        deferred = False
+        try:
+            deferred = work()
+        except DeadlineExceeded as e:
+            logger.warning(f"⏰ {e}, döngünün kalan işleri iptal edildi")
+        finally:
+            self.deadline = None
+            if not deferred:
+                record_cycle(deadline.report(), metrics=self.metrics, path=self.over_budget_path, cycle=cycle)
+
+    def _run_cycle(self, deadline: CycleDeadline, defer=None) -> bool:
+        """Trendleri topla, tweet'leri üret ve at; kalan tweet'ler sonraya planlandıysa True"""
         # 10 trend al
-        top_10_trends = self.get_top_10_trends()
+        with deadline.stage('collect'):
+            top_10_trends = self.get_top_10_trends()
         
         if not top_10_trends or len(top_10_trends) < 2:
             logger.warning("⚠️ Yeterli trend bulunamadı! (En az 2 trend gerekli)")
-            return
+            return False
         
         logger.info("")
         logger.info(f"TOPLAM {len(top_10_trends)} TREND BULUNDU:")
@@ -384,14 +790,30 @@ class TwitterTrendTweetBot:
         logger.info("=" * 60)
         logger.info("")
         
+        # Tüm trendler için tweet'leri tek istekte üret (başarısız olanlar tekli üretilir)
+        batch_tweets = {}
+        if self.config.current.batch_generation and len(selected_trends) > 1:
+            with deadline.stage('generate'):
+                batch_tweets = self.generate_tweets_batch(selected_trends)
+        
+        return self._post_trends(deadline, selected_trends, batch_tweets, 0, defer)
+
+    def _post_trends(self, deadline: CycleDeadline, trends: List[str], batch_tweets: Dict[str, str],
+                     start: int, defer=None) -> bool:
+        """trends[start:] için tweet üretip atar; aradaki bekleme defer ile planlandıysa True"""
         # Her trend için ayrı tweet oluştur ve at
-        for i, trend in enumerate(selected_trends, 1):
+        for index in range(start, len(trends)):
+            i, trend = index + 1, trends[index]
             logger.info("")
-            logger.info(f"--- Trend {i}/2: {trend} ---")
+            logger.info(f"--- Trend {i}/{len(trends)}: {trend} ---")
             
-            # AI ile tweet oluştur
-            tweet_text = self.generate_tweet_with_ai(trend)
+            # AI ile tweet oluştur (toplu üretilen tweet öncekilere benziyorsa tekli yeniden üretilir)
+            tweet_text = batch_tweets.get(trend)
+            if not tweet_text or self.is_repeat(tweet_text):
+                with deadline.stage('generate'):
+                    tweet_text = self.generate_tweet_with_ai(trend)
             
+            # Tweet üretilemediyse beklemeden sonraki trende geç (bütçe kalan trendlere kalsın)
             if not tweet_text:
                 logger.warning(f"⚠️ '{trend}' için tweet oluşturulamadı, atlanıyor...")
                 continue
@@ -399,57 +821,106 @@ class TwitterTrendTweetBot:
             logger.info(f"Oluşturulan tweet: {tweet_text}")
             
             # Tweet'i at
-            success = self.post_tweet(tweet_text)
+            with deadline.stage('post'):
+                success = self.post_tweet(tweet_text)
             
             if success:
                 logger.info(f"✅ '{trend}' için tweet başarıyla atıldı!")
+                self.similarity.add(tweet_text)
             else:
                 logger.error(f"❌ '{trend}' için tweet atılamadı!")
             
-            # İkinci tweet için rastgele bekle (1-4 dakika arası, ortalama 2.5 dakika)
-            if i < len(selected_trends):
+            # Sonraki tweet için rastgele bekle (varsayılan 1-4 dakika arası, ortalama 2.5 dakika)
+            if i < len(trends):
                 import random
-                wait_minutes = random.uniform(1.0, 4.0)  # 1-4 dakika arası rastgele
+                settings = self.config.current
+                wait_minutes = random.uniform(settings.post_gap_min_minutes, settings.post_gap_max_minutes)
                 wait_seconds = int(wait_minutes * 60)
-                logger.info(f"⏳ Sonraki tweet için {wait_minutes:.1f} dakika ({wait_seconds} saniye) bekleniyor...")
-                time.sleep(wait_seconds)
+                # Bekleme döngü bütçesine sığmıyorsa kalan tweet'ler bu döngüde atılmaz (döngü bütçeyi aşmış sayılmaz)
+                if not deadline.fits(wait_seconds):
+                    skipped = len(trends) - i
+                    logger.warning(
+                        f"⏭️ {wait_minutes:.1f} dakikalık bekleme döngü bütçesine sığmıyor "
+                        f"({deadline.remaining():.0f} sn kaldı), {skipped} tweet atlandı"
+                    )
+                    self.metrics.incr('cycle.skipped_posts', skipped)
+                    return False
+                if defer is None:
+                    logger.info(f"⏳ Sonraki tweet için {wait_minutes:.1f} dakika ({wait_seconds} saniye) bekleniyor...")
+                    with deadline.stage('post_gap'):
+                        deadline.sleep(wait_seconds)
+                    continue
+                logger.info(f"⏳ Sonraki tweet {wait_minutes:.1f} dakika ({wait_seconds} saniye) sonraya planlandı")
+                cycle = self.cycle_count
+                defer(wait_seconds, lambda: self._run_with_deadline(
+                    deadline, cycle, lambda: self._post_trends(deadline, trends, batch_tweets, index + 1, defer)
+                ))
+                return True
+        return False
 
     def run(self):
         """Bot'u sürekli çalıştır (her 5 dakikada bir)"""
         logger.info("=" * 60)
         logger.info("Twitter Trend Tweet Bot Başlatıldı")
-        logger.info("Her 5 dakikada bir TÜM trendler için ağır troll tweet atacak")
+        logger.info(f"Her {self.config.current.cycle_minutes} dakikada bir TÜM trendler için ağır troll tweet atacak")
         logger.info("=" * 60)
         
-        while True:
-            try:
-                # Bir kez çalıştır
-                self.run_once()
-                
-                # 5 dakika bekle (300 saniye)
-                wait_minutes = 5
-                logger.info("")
-                logger.info("=" * 60)
-                logger.info(f"⏳ {wait_minutes} dakika bekleniyor... (Sonraki trend tweet'leri için)")
-                logger.info("=" * 60)
-                time.sleep(wait_minutes * 60)
-                
-            except KeyboardInterrupt:
-                logger.info("")
-                logger.info("Bot durduruldu (Ctrl+C)")
-                break
-            except Exception as e:
-                logger.error(f"❌ Hata: {e}")
-                logger.info("5 dakika sonra tekrar denenecek...")
-                time.sleep(5 * 60)  # Hata olursa da 5 dakika bekle
+        # Yapılandırma dosyası değişirse yeniden başlatmadan devreye al
+        self.config.start()
+        
+        # Önceki çalışmanın trendleri, rate limit durumu ve çıkarma istatistikleri
+        self.restore_state()
+        if self.memory:
+            self.memory.start()
+        
+        # Döngüler iş süresinden bağımsız olarak cycle_minutes'lık sabit slotlarda başlar;
+        # ikinci tweet tek seferlik iş olarak planlanır, sonraki trend toplamayı geciktirmez
+        settings = self.config.current
+        self.scheduler = Scheduler(clock=self.clock, metrics=self.metrics)
+        self.scheduler.every(
+            'cycle',
+            period=lambda: self.config.current.cycle_minutes * 60,
+            func=self._scheduled_cycle,
+            jitter=lambda: self.config.current.cycle_jitter_seconds,
+            retry_after=lambda: self.config.current.error_retry_minutes * 60,
+        )
+        logger.info(f"📅 Döngüler {settings.cycle_minutes} dakikalık sabit slotlarda başlayacak "
+                    f"(+0-{settings.cycle_jitter_seconds:g} sn rastgele gecikme)")
+        
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            logger.info("")
+            logger.info("Bot durduruldu (Ctrl+C)")
+            self.save_state()
+
+    def _scheduled_cycle(self):
+        """Zamanlayıcının her slotta çalıştırdığı döngü"""
+        self.run_once(defer=lambda delay, work: self.scheduler.once('post', delay, work))
+        
+        # Açık devreleri ve takvim istatistiklerini logla, metrikleri dosyaya yaz
+        self.breakers.log_states(logger)
+        self.groq.log_comparison(logger)
+        self.scheduler.log_stats(logger)
+        if self.memory:
+            self.memory.checkpoint(self.cycle_count)
+        self.metrics.dump()
+        self.save_state()
 
 
 def main():
     """Ana fonksiyon"""
-    bot = TwitterTrendTweetBot()
-    bot.run()
+    # BOT_HTTP_MODE=record/replay ise HTTP istekleri kaydedilir / kayıttan oynatılır
+    http_cassette.install_from_env('trend_tweet_bot')
+    stop_on_sigterm()
+    try:
+        bot = TwitterTrendTweetBot()
+        bot.run()
+    except http_cassette.CassetteExhausted:
+        logger.info("📼 Kayıttaki tüm istekler oynatıldı, bot durduruluyor")
+    finally:
+        http_cassette.uninstall()
 
 
 if __name__ == "__main__":
     main()
-